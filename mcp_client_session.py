@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Shared MCP client session for the live test scripts."""
+
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from mcp.client.session import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+
+MCP_URL = "http://localhost:9900/mcp"
+# Characters of a tool result checked before scanning the rest
+HEAD_CHARS = 2048
+
+# One initialized session per process, reused by every caller until close_session()
+_session = None
+_exit_stack = None
+_lock = asyncio.Lock()
+
+
+async def get_session(url=MCP_URL):
+    """Return the shared MCP session, connecting and initializing it on first use.
+
+    The streamable HTTP transport must be closed by the task that opened it, so the
+    first call (and close_session) should be made from the script's main task.
+    """
+    global _session, _exit_stack
+    async with _lock:
+        if _session is None:
+            stack = AsyncExitStack()
+            try:
+                read_stream, write_stream, _ = await stack.enter_async_context(
+                    streamablehttp_client(url)
+                )
+                session = await stack.enter_async_context(ClientSession(read_stream, write_stream))
+                await session.initialize()
+            except BaseException:
+                await stack.aclose()
+                raise
+            _session, _exit_stack = session, stack
+    return _session
+
+
+async def close_session():
+    """Close the shared MCP session, if one is open."""
+    global _session, _exit_stack
+    if _exit_stack is not None:
+        stack = _exit_stack
+        _session = _exit_stack = None
+        await stack.aclose()
+
+
+@asynccontextmanager
+async def mcp_session(url=MCP_URL):
+    """Yield the shared MCP session; it stays open for later callers until close_session()."""
+    yield await get_session(url)
+
+
+def mentions(text, needle, head=HEAD_CHARS):
+    """Return whether needle occurs in a tool result, checking its first head characters first.
+
+    Index listings put their matches near the top, so the usual hit costs a scan of
+    a couple of KB; otherwise the rest of the text is searched without rescanning the head.
+    """
+    if needle in text[:head]:
+        return True
+    return text.find(needle, max(head - len(needle) + 1, 0)) != -1
@@ -1,8 +1,56 @@
 # Copyright OpenSearch Contributors
 # SPDX-License-Identifier: Apache-2.0
 
-from .stdio_server import serve as serve_stdio
-from .streaming_server import serve as serve_streaming
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+
+def __getattr__(name: str):
+    # Transport modules are imported on first use so that starting one transport
+    # does not pay the import cost of the other
+    if name == 'serve_stdio':
+        from .stdio_server import serve
+
+        return serve
+    if name == 'serve_streaming':
+        from .streaming_server import serve
+
+        return serve
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+# Command line defaults, also used when main() is called without arguments
+_DEFAULT_ARGS = {
+    'transport': 'stdio',
+    'host': '0.0.0.0',
+    'port': 9900,
+    'mode': 'single',
+    'profile': '',
+    'config': '',
+}
+
+
+@lru_cache(maxsize=1)
+def _resolve_env_path() -> Optional[Path]:
+    """Locate the .env file to load, resolved once per process.
+
+    Returns:
+        Optional[Path]: MCP_ENV_FILE if set, otherwise the first existing candidate, or None
+    """
+    env_file = os.getenv('MCP_ENV_FILE')
+    if env_file:
+        env_path = Path(env_file)
+        return env_path if env_path.exists() else None
+
+    # Look for .env in current directory, parent directory, and src parent directory
+    env_paths = (
+        Path.cwd() / '.env',
+        Path.cwd().parent / '.env',
+        Path(__file__).parent.parent.parent / '.env',
+    )
+    return next((p for p in env_paths if p.exists()), None)
 
 
 def main() -> None:
@@ -10,31 +58,20 @@ def main() -> None:
     Main entry point for the OpenSearch MCP Server.
     Handles command line arguments and starts the appropriate server based on transport type.
     """
-    import argparse
     import asyncio
     import logging
-    import os
-    from pathlib import Path
-    
+    import sys
+    from types import SimpleNamespace
+
+    from .env_config import load_env_file
+
     # Load .env file if it exists
-    try:
-        from dotenv import load_dotenv
-        # Look for .env in current directory, parent directory, and src parent directory
-        env_paths = [
-            Path.cwd() / '.env',
-            Path.cwd().parent / '.env',
-            Path(__file__).parent.parent.parent / '.env'
-        ]
-        
-        for env_path in env_paths:
-            if env_path.exists():
-                load_dotenv(env_path)
-                logging.info(f'Loaded environment variables from {env_path}')
-                break
-        else:
-            logging.info('No .env file found, using system environment variables')
-    except ImportError:
-        logging.warning('python-dotenv not installed, using system environment variables only')
+    env_path = _resolve_env_path()
+    if env_path:
+        load_env_file(str(env_path))
+        logging.info(f'Loaded environment variables from {env_path}')
+    else:
+        logging.info('No .env file found, using system environment variables')
 
     # Configure logging
     logging.basicConfig(
@@ -42,37 +79,70 @@ def main() -> None:
     )
     logger = logging.getLogger(__name__)
 
-    logger.info('Starting MCP server...')
+    from opensearch.client import configure_client_module
 
-    # Set up command line argument parser
-    parser = argparse.ArgumentParser(description='OpenSearch MCP Server')
-    parser.add_argument(
-        '--transport',
-        choices=['stdio', 'stream'],
-        default='stdio',
-        help='Transport type (stdio or stream)',
-    )
-    parser.add_argument('--host', default='0.0.0.0', help='Host to bind to (streaming only)')
-    parser.add_argument(
-        '--port', type=int, default=9900, help='Port to listen on (streaming only)'
+    configure_client_module(
+        insecure_ssl=os.getenv('OPENSEARCH_SSL_VERIFY', 'true').lower() == 'false'
     )
-    parser.add_argument(
-        '--mode',
-        choices=['single', 'multi'],
-        default='single',
-        help='Server mode: single (default) uses environment variables for OpenSearch connection, multi requires explicit connection parameters',
-    )
-    parser.add_argument(
-        '--profile', default='', help='AWS profile to use for OpenSearch connection'
-    )
-    parser.add_argument('--config', default='', help='Path to a YAML configuration file')
 
-    args = parser.parse_args()
+    logger.info('Starting MCP server...')
+
+    if len(sys.argv) == 1:
+        # No arguments (the usual stdio launch by MCP clients): skip building the parser
+        args = SimpleNamespace(**_DEFAULT_ARGS)
+    else:
+        import argparse
+
+        # Set up command line argument parser
+        parser = argparse.ArgumentParser(description='OpenSearch MCP Server')
+        parser.add_argument(
+            '--transport',
+            choices=['stdio', 'stream'],
+            default=_DEFAULT_ARGS['transport'],
+            help='Transport type (stdio or stream)',
+        )
+        parser.add_argument(
+            '--host', default=_DEFAULT_ARGS['host'], help='Host to bind to (streaming only)'
+        )
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=_DEFAULT_ARGS['port'],
+            help='Port to listen on (streaming only)',
+        )
+        parser.add_argument(
+            '--mode',
+            choices=['single', 'multi'],
+            default=_DEFAULT_ARGS['mode'],
+            help='Server mode: single (default) uses environment variables for OpenSearch connection, multi requires explicit connection parameters',
+        )
+        parser.add_argument(
+            '--profile',
+            default=_DEFAULT_ARGS['profile'],
+            help='AWS profile to use for OpenSearch connection',
+        )
+        parser.add_argument(
+            '--config', default=_DEFAULT_ARGS['config'], help='Path to a YAML configuration file'
+        )
+
+        args = parser.parse_args()
+
+    # Use uvloop's event loop when the optional 'speed' extra is installed
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
     # Start the appropriate server based on transport type
     if args.transport == 'stdio':
+        from .stdio_server import serve as serve_stdio
+
         asyncio.run(serve_stdio(mode=args.mode, profile=args.profile, config=args.config))
     else:
+        from .streaming_server import serve as serve_streaming
+
         asyncio.run(
             serve_streaming(
                 host=args.host,
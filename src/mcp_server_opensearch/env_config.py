@@ -0,0 +1,35 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+
+# KEY=VALUE lines, skipping comments; surrounding whitespace is not captured
+_ENV_LINE = re.compile(r'(?m)^[ \t]*(?!#)([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*\r?$')
+
+
+@lru_cache(maxsize=1)
+def load_env_file(env_path: str) -> None:
+    """Load variables from a .env file, reading it at most once per process.
+
+    python-dotenv is used when installed; otherwise a minimal KEY=VALUE parser is used.
+    Either way, variables already set in the environment are not overridden.
+
+    Args:
+        env_path: Path to the .env file
+    """
+    if not os.path.exists(env_path):
+        return
+
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        data = Path(env_path).read_text(encoding='utf-8')
+        for key, value in _ENV_LINE.findall(data):
+            os.environ.setdefault(key, value)
+        return
+
+    load_dotenv(env_path, override=False)
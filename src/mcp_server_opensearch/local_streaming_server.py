@@ -4,18 +4,8 @@
 import logging
 import os
 import sys
-import uvicorn
-import contextlib
-from typing import AsyncIterator
 from mcp.server import Server
-from mcp.server.sse import SseServerTransport
 from mcp.types import TextContent, Tool
-from starlette.applications import Starlette
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.routing import Mount, Route
-from starlette.types import Scope, Receive, Send
-from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 
 # Add the src directory to Python path to fix imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -23,17 +13,16 @@ src_dir = os.path.join(current_dir, '..')
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
+from mcp_server_opensearch.starlette_app import MCPStarletteApp, uvicorn_log_options
+
+ENV_PATH = os.path.join(current_dir, '..', '..', '..', '.env')
+
 
 def load_env_config():
     """Load configuration from .env file"""
-    env_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.env')
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and '=' in line and not line.startswith('#'):
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+    from mcp_server_opensearch.env_config import load_env_file
+
+    load_env_file(ENV_PATH)
 
 
 async def create_local_mcp_server() -> Server:
@@ -50,6 +39,9 @@ async def create_local_mcp_server() -> Server:
     if 'localhost:9200' not in opensearch_url:
         logging.warning(f"Expected localhost:9200 but got {opensearch_url}, using localhost:9200")
         os.environ['OPENSEARCH_URL'] = 'http://localhost:9200'
+        from opensearch.client import refresh_env
+
+        refresh_env()
     
     logging.info(f"Connecting to local OpenSearch cluster: {os.environ['OPENSEARCH_URL']}")
     
@@ -66,18 +58,19 @@ async def create_local_mcp_server() -> Server:
         enabled_tools = {}
         logging.info('Using fallback: no tools available due to configuration error')
 
+    # The tool set is fixed once the server is created, so build the list once
+    tools = [
+        Tool(
+            name=tool_name,
+            description=tool_info['description'],
+            inputSchema=tool_info['input_schema'],
+        )
+        for tool_name, tool_info in enabled_tools.items()
+    ]
+
     @server.list_tools()
     async def list_tools() -> list[Tool]:
-        tools = []
-        for tool_name, tool_info in enabled_tools.items():
-            tools.append(
-                Tool(
-                    name=tool_name,
-                    description=tool_info['description'],
-                    inputSchema=tool_info['input_schema'],
-                )
-            )
-        return tools
+        return list(tools)
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
@@ -90,60 +83,11 @@ async def create_local_mcp_server() -> Server:
     return server
 
 
-class LocalMCPStarletteApp:
+class LocalMCPStarletteApp(MCPStarletteApp):
     """Starlette app configured for local OpenSearch cluster"""
-    
-    def __init__(self, mcp_server: Server):
-        self.mcp_server = mcp_server
-        self.sse = SseServerTransport('/messages/')
-        self.session_manager = StreamableHTTPSessionManager(
-            app=self.mcp_server,
-            event_store=None,
-            json_response=False,
-            stateless=False,
-        )
 
-    async def handle_sse(self, request: Request) -> None:
-        async with self.sse.connect_sse(
-            request.scope,
-            request.receive,
-            request._send,
-        ) as (read_stream, write_stream):
-            await self.mcp_server.run(
-                read_stream,
-                write_stream,
-                self.mcp_server.create_initialization_options(),
-            )
-        return Response()
-
-    async def handle_health(self, request: Request) -> Response:
-        """Health check endpoint"""
-        return Response('Local OpenSearch MCP Server - OK', status_code=200)
-
-    @contextlib.asynccontextmanager
-    async def lifespan(self, app: Starlette) -> AsyncIterator[None]:
-        """Context manager for session manager lifecycle"""
-        async with self.session_manager.run():
-            logging.info('Local OpenSearch MCP Server started with StreamableHTTP session manager!')
-            try:
-                yield
-            finally:
-                logging.info('Local OpenSearch MCP Server shutting down...')
-
-    async def handle_streamable_http(self, scope: Scope, receive: Receive, send: Send) -> None:
-        """Handle streamable HTTP requests"""
-        await self.session_manager.handle_request(scope, receive, send)
-
-    def create_app(self) -> Starlette:
-        return Starlette(
-            routes=[
-                Route('/sse', endpoint=self.handle_sse, methods=['GET']),
-                Route('/health', endpoint=self.handle_health, methods=['GET']),
-                Mount('/messages/', app=self.sse.handle_post_message),
-                Mount('/mcp', app=self.handle_streamable_http),
-            ],
-            lifespan=self.lifespan,
-        )
+    health_message = 'Local OpenSearch MCP Server - OK'
+    server_label = 'Local OpenSearch MCP Server'
 
 
 async def serve_local(
@@ -151,6 +95,8 @@ async def serve_local(
     port: int = 9200,
 ) -> None:
     """Start the local OpenSearch MCP streaming server"""
+    import uvicorn
+
     logging.basicConfig(level=logging.INFO)
     logging.info(f"Starting Local OpenSearch MCP Server on {host}:{port}")
     
@@ -158,11 +104,15 @@ async def serve_local(
     app_handler = LocalMCPStarletteApp(mcp_server)
     app = app_handler.create_app()
 
+    # The 'auto' HTTP parser picks httptools when the 'speed' extra is installed.
+    # serve() runs on the caller's loop, which is uvloop only if the caller set its
+    # policy (as __main__ does); websockets are never served here
     config = uvicorn.Config(
         app=app,
         host=host,
         port=port,
-        log_level="info"
+        **uvicorn_log_options(),
+        ws='none',
     )
     server = uvicorn.Server(config)
     await server.serve()
@@ -170,4 +120,11 @@ async def serve_local(
 
 if __name__ == '__main__':
     import asyncio
+
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(serve_local())
\ No newline at end of file
@@ -1,23 +1,22 @@
 # Copyright OpenSearch Contributors
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import logging
 import os
 import sys
-import uvicorn
-import contextlib
 import json
-from typing import AsyncIterator, Dict, Any, List
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Any, List, Optional
 from mcp.server import Server
-from mcp.server.sse import SseServerTransport
 from mcp.types import TextContent, Tool
+from pydantic import BaseModel, Field, ValidationError
 from starlette.applications import Starlette
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.routing import Mount, Route
-from starlette.types import Scope, Receive, Send
-from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
-from opensearchpy import OpenSearch
+
+if TYPE_CHECKING:
+    from opensearchpy import AsyncOpenSearch
 
 # Add the src directory to Python path to fix imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -25,21 +24,47 @@ src_dir = os.path.join(current_dir, '..')
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
+from mcp_server_opensearch.starlette_app import MCPStarletteApp, uvicorn_log_options
+
+ENV_PATH = os.path.join(current_dir, '..', '..', '..', '.env')
+
 
 def load_env_config():
     """Load configuration from .env file"""
-    env_path = os.path.join(current_dir, '..', '..', '..', '.env')
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and '=' in line and not line.startswith('#'):
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
-
-
-def get_local_opensearch_client() -> OpenSearch:
-    """Create a simple OpenSearch client for local cluster"""
+    from mcp_server_opensearch.env_config import load_env_file
+
+    load_env_file(ENV_PATH)
+
+
+# Fields searched by search_logs_by_keyword
+_MESSAGE_FIELDS = ('message', 'msg', 'log')
+# Fields printed explicitly by format_log_search_results, as (label, fields in priority order)
+_FIELD_GROUPS = (
+    ('Timestamp', ('@timestamp', 'timestamp', 'time')),
+    ('Message', _MESSAGE_FIELDS),
+    ('Level', ('level', 'severity', 'log_level')),
+    ('Host', ('host', 'hostname', 'server')),
+)
+# field -> (group index, priority within the group)
+_FIELD_SLOTS = {
+    field: (group, rank)
+    for group, (_, fields) in enumerate(_FIELD_GROUPS)
+    for rank, field in enumerate(fields)
+}
+_UNSET_RANKS = tuple(len(fields) for _, fields in _FIELD_GROUPS)
+
+# Shared client, created on first use and closed when the app shuts down
+_CLIENT: Optional['AsyncOpenSearch'] = None
+
+
+def get_local_opensearch_client() -> 'AsyncOpenSearch':
+    """Return the shared OpenSearch client for local cluster, creating it on first use"""
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+
+    from opensearchpy import AsyncOpenSearch
+
     opensearch_url = os.getenv('OPENSEARCH_URL', 'http://localhost:9200')
     
     client_kwargs = {
@@ -47,9 +72,222 @@ def get_local_opensearch_client() -> OpenSearch:
         'use_ssl': opensearch_url.startswith('https'),
         'verify_certs': False,  # For local development
         'ssl_show_warn': False,
+        'maxsize': 32,
+        'http_compress': True,
+        'timeout': 30,
     }
     
-    return OpenSearch(**client_kwargs)
+    _CLIENT = AsyncOpenSearch(**client_kwargs)
+    return _CLIENT
+
+
+async def close_local_opensearch_client() -> None:
+    """Close the shared OpenSearch client, if one was created"""
+    global _CLIENT, _BATCHER
+    _BATCHER = None
+    if _CLIENT is not None:
+        client, _CLIENT = _CLIENT, None
+        await client.close()
+
+
+class MSearchBatcher:
+    """Coalesce concurrent searches into a single _msearch request.
+
+    A search is sent as soon as no other request is in flight. Searches arriving
+    while a request is in flight are queued and sent together when it returns, or
+    after window_ms at the latest. A batch holding a single search is sent as a
+    plain _search request.
+    """
+
+    def __init__(self, client: 'AsyncOpenSearch', window_ms: float = 20, max_batch: int = 50):
+        self.client = client
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: List[tuple] = []
+        self._inflight = 0
+        self._timer: Optional[asyncio.Handle] = None
+        self._tasks: set = set()
+
+    async def submit(self, index: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a search and wait for its response"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((future, index, body))
+        if self._timer is None:
+            # Send on the next loop iteration, so searches submitted together
+            # share a request, or wait for the request in flight
+            if self._inflight:
+                self._timer = loop.call_later(self.window, self._start_flush)
+            else:
+                self._timer = loop.call_soon(self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        """Send every queued search, in batches of at most max_batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            self._inflight += 1
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[tuple]) -> None:
+        try:
+            await self._flush(batch)
+        finally:
+            self._inflight -= 1
+            if self._pending and not self._inflight:
+                self._start_flush()
+
+    async def _flush(self, batch: List[tuple]) -> None:
+        from opensearchpy.exceptions import TransportError
+
+        try:
+            if len(batch) == 1:
+                _, index, body = batch[0]
+                responses = [await self.client.search(index=index, body=body)]
+            else:
+                lines = []
+                for _, index, body in batch:
+                    lines.append(json.dumps({'index': index}))
+                    lines.append(json.dumps(body))
+                response = await self.client.msearch(body='\n'.join(lines) + '\n')
+                responses = response['responses']
+        except Exception as e:
+            for future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (future, _, _), result in zip(batch, responses):
+            if future.done():
+                continue
+            if 'error' in result:
+                error = result['error']
+                error_type = error.get('type', 'unknown') if isinstance(error, dict) else str(error)
+                future.set_exception(TransportError(result.get('status', 500), error_type, error))
+            else:
+                future.set_result(result)
+
+
+_MSEARCH_WINDOW_MS = float(os.getenv('MCP_MSEARCH_WINDOW_MS', '20'))
+_BATCHER: Optional[MSearchBatcher] = None
+
+
+def _get_batcher(client: 'AsyncOpenSearch') -> MSearchBatcher:
+    """Return the process-wide search batcher for the given client"""
+    global _BATCHER
+    if _BATCHER is None or _BATCHER.client is not client:
+        _BATCHER = MSearchBatcher(client, window_ms=_MSEARCH_WINDOW_MS)
+    return _BATCHER
+
+
+class SearchLogsByKeywordArgs(BaseModel):
+    keyword: str = Field(
+        min_length=1,
+        description='Keyword to search for in log messages (e.g., "authentication", "error", "failed")',
+    )
+    index_pattern: str = Field(
+        default='*',
+        description='Index pattern to search in (e.g., "agent-inventory-log-*", "*", or specific index name)',
+    )
+    size: int = Field(
+        default=10, ge=1, le=100, description='Number of results to return (default: 10, max: 100)'
+    )
+    time_range: str = Field(
+        default='', description='Time range for search (e.g., "1h", "24h", "7d"). Optional.'
+    )
+
+
+class SearchLogsAdvancedArgs(BaseModel):
+    index_pattern: str = Field(default='*', description='Index pattern to search in')
+    query: Dict[str, Any] = Field(
+        min_length=1, description='OpenSearch query DSL for complex searches'
+    )
+    size: int = Field(default=10, description='Number of results to return (default: 10)')
+
+
+class ListLogIndicesArgs(BaseModel):
+    pattern: str = Field(
+        default='', description='Filter indices by pattern (e.g., "log", "agent")'
+    )
+
+
+class ClusterHealthArgs(BaseModel):
+    pass
+
+
+# Short-lived cache for polled, slowly changing responses (cluster_health, list_log_indices)
+_RESP_CACHE_TTL = float(os.getenv('MCP_RESP_TTL', '2.0'))
+_RESP_CACHE_MAXSIZE = 64
+_RESP_CACHE: Dict[tuple, tuple[float, List[TextContent]]] = {}
+_RESP_INFLIGHT: Dict[tuple, asyncio.Task] = {}
+
+
+async def _cached_response(
+    key: tuple, fetch: Callable[[], Awaitable[List[TextContent]]]
+) -> List[TextContent]:
+    """Return the cached result for key, or fetch it once for all concurrent callers.
+
+    The fetch runs in a task owned by the cache, so a caller that is cancelled
+    stops waiting without cancelling the fetch for the others.
+
+    Args:
+        key: Cache key, e.g. (tool name, pattern)
+        fetch: Coroutine function producing the result on a cache miss
+
+    Returns:
+        List[TextContent]: The cached or freshly fetched result
+    """
+    entry = _RESP_CACHE.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+
+    task = _RESP_INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_store(key, fetch))
+        # Retrieve a failure even when every caller has stopped waiting
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        _RESP_INFLIGHT[key] = task
+    return await asyncio.shield(task)
+
+
+async def _fetch_and_store(
+    key: tuple, fetch: Callable[[], Awaitable[List[TextContent]]]
+) -> List[TextContent]:
+    """Fetch the result for key and cache it, evicting expired or oldest entries when full"""
+    try:
+        result = await fetch()
+    finally:
+        del _RESP_INFLIGHT[key]
+
+    if len(_RESP_CACHE) >= _RESP_CACHE_MAXSIZE:
+        now = time.monotonic()
+        for stale_key in [k for k, (expires, _) in _RESP_CACHE.items() if expires <= now]:
+            del _RESP_CACHE[stale_key]
+        if len(_RESP_CACHE) >= _RESP_CACHE_MAXSIZE:
+            del _RESP_CACHE[next(iter(_RESP_CACHE))]
+    _RESP_CACHE[key] = (time.monotonic() + _RESP_CACHE_TTL, result)
+    return result
+
+
+@lru_cache(maxsize=1)
+def _json_encoder() -> Callable[[Any], str]:
+    """Return an indenting JSON encoder, using orjson when the 'speed' extra is installed"""
+    try:
+        import orjson
+    except ImportError:
+        return lambda obj: json.dumps(obj, indent=2)
+    return lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize an OpenSearch response for display"""
+    return _json_encoder()(obj)
 
 
 def format_log_search_results(hits: List[Dict], keyword: str) -> str:
@@ -57,48 +295,213 @@ def format_log_search_results(hits: List[Dict], keyword: str) -> str:
     if not hits:
         return f"No logs found containing '{keyword}'"
     
-    summary = f"Found {len(hits)} logs containing '{keyword}':\n\n"
+    parts = [f"Found {len(hits)} logs containing '{keyword}':\n\n"]
     
     for i, hit in enumerate(hits, 1):
         source = hit.get('_source', {})
         index = hit.get('_index', 'unknown')
         score = hit.get('_score', 0)
         
-        summary += f"=== Log {i} (Score: {score:.2f}) ===\n"
-        summary += f"Index: {index}\n"
-        
-        # Extract key fields commonly found in logs
-        timestamp = source.get('@timestamp') or source.get('timestamp') or source.get('time')
-        if timestamp:
-            summary += f"Timestamp: {timestamp}\n"
-        
-        message = source.get('message') or source.get('msg') or source.get('log')
-        if message:
-            summary += f"Message: {message}\n"
-        
-        level = source.get('level') or source.get('severity') or source.get('log_level')
-        if level:
-            summary += f"Level: {level}\n"
+        parts.append(f"=== Log {i} (Score: {score:.2f}) ===\n")
+        parts.append(f"Index: {index}\n")
         
-        host = source.get('host') or source.get('hostname') or source.get('server')
-        if host:
-            if isinstance(host, dict):
-                host = host.get('name', host)
-            summary += f"Host: {host}\n"
-        
-        # Add other relevant fields
+        # Pick the highest-priority non-empty field of each group and collect
+        # the other short fields in a single pass over the source
+        values = [None] * len(_FIELD_GROUPS)
+        ranks = list(_UNSET_RANKS)
+        extras = []
         for key, value in source.items():
-            if key not in ['@timestamp', 'timestamp', 'time', 'message', 'msg', 'log', 'level', 'severity', 'log_level', 'host', 'hostname', 'server']:
+            slot = _FIELD_SLOTS.get(key)
+            if slot is None:
                 if len(str(value)) < 100:  # Only show short values
-                    summary += f"{key}: {value}\n"
+                    extras.append(f"{key}: {value}\n")
+            elif value and slot[1] < ranks[slot[0]]:
+                values[slot[0]] = value
+                ranks[slot[0]] = slot[1]
+
+        for (label, _), value in zip(_FIELD_GROUPS, values):
+            if value:
+                if isinstance(value, dict):  # e.g. ECS host objects
+                    value = value.get('name', value)
+                parts.append(f"{label}: {value}\n")
+        parts.extend(extras)
         
-        summary += "\n"
+        parts.append("\n")
+    
+    return ''.join(parts)
+
+
+def _error_result(name: str, error: Exception) -> List[TextContent]:
+    """Report a failed tool call to the client"""
+    return [TextContent(type='text', text=f'Error executing {name}: {str(error)}')]
+
+
+async def _handle_search_by_keyword(
+    args: Dict[str, Any], client: 'AsyncOpenSearch'
+) -> List[TextContent]:
+    """Search log messages for a keyword and summarize the matching logs"""
+    from opensearchpy.exceptions import OpenSearchException
+
+    keyword = args['keyword']
+    
+    # Build query: one phrase-prefix match across the message fields
+    # instead of per-field match + leading-wildcard clauses
+    keyword_query = {
+        "multi_match": {
+            "query": keyword,
+            "fields": list(_MESSAGE_FIELDS),
+            "type": "phrase_prefix"
+        }
+    }
+    
+    # Add time range if specified
+    if args['time_range']:
+        keyword_query = {
+            "bool": {
+                "must": [keyword_query],
+                "filter": [{
+                    "range": {
+                        "@timestamp": {
+                            "gte": f"now-{args['time_range']}"
+                        }
+                    }
+                }]
+            }
+        }
+    
+    query = {
+        "query": keyword_query,
+        "size": args['size'],
+        "sort": [{"@timestamp": {"order": "desc"}}]
+    }
     
-    return summary
+    try:
+        response = await _get_batcher(client).submit(args['index_pattern'], query)
+    except OpenSearchException as e:
+        return _error_result('search_logs_by_keyword', e)
+    hits = response.get('hits', {}).get('hits', [])
+    
+    formatted_result = format_log_search_results(hits, keyword)
+    return [TextContent(type='text', text=formatted_result)]
+
+
+async def _handle_search_advanced(
+    args: Dict[str, Any], client: 'AsyncOpenSearch'
+) -> List[TextContent]:
+    """Run a caller-supplied query DSL search"""
+    from opensearchpy.exceptions import OpenSearchException
+
+    query = args['query']
+    
+    # Ensure size is set in query
+    if 'size' not in query:
+        query['size'] = args['size']
+    
+    try:
+        response = await client.search(index=args['index_pattern'], body=query)
+    except OpenSearchException as e:
+        return _error_result('search_logs_advanced', e)
+    return [TextContent(type='text', text=_dumps(response))]
+
+
+async def _handle_list_indices(
+    args: Dict[str, Any], client: 'AsyncOpenSearch'
+) -> List[TextContent]:
+    """List indices whose name contains the pattern"""
+    from opensearchpy.exceptions import OpenSearchException
+
+    # Index names are lowercase, so match the pattern case-insensitively
+    pattern = args['pattern'].lower()
+
+    async def list_indices() -> List[TextContent]:
+        # Filter indices containing the pattern on the server, fetching only the shown columns
+        response = await client.cat.indices(
+            index=f'*{pattern}*' if pattern else '*',
+            format='json',
+            h='index,docs.count,store.size',
+            s='index',
+        )
+        
+        # Format for better readability
+        if response:
+            result = "Available indices:\n\n"
+            for idx in response:
+                index_name = idx.get('index', 'N/A')
+                doc_count = idx.get('docs.count', 'N/A')
+                size = idx.get('store.size', 'N/A')
+                result += f"• {index_name} (docs: {doc_count}, size: {size})\n"
+        else:
+            result = "No indices found matching the pattern."
+        
+        return [TextContent(type='text', text=result)]
+
+    try:
+        return await _cached_response(('list_log_indices', pattern), list_indices)
+    except OpenSearchException as e:
+        return _error_result('list_log_indices', e)
+
+
+async def _handle_cluster_health(
+    args: Dict[str, Any], client: 'AsyncOpenSearch'
+) -> List[TextContent]:
+    """Report cluster health"""
+    from opensearchpy.exceptions import OpenSearchException
+
+    async def cluster_health() -> List[TextContent]:
+        response = await client.cluster.health()
+        return [TextContent(type='text', text=_dumps(response))]
+
+    try:
+        return await _cached_response(('cluster_health', ''), cluster_health)
+    except OpenSearchException as e:
+        return _error_result('cluster_health', e)
+
+
+# Tools focused on log searching; fixed for the life of the process
+_TOOLS_INFO = MappingProxyType({
+    'search_logs_by_keyword': {
+        'description': 'Search for logs containing specific keywords across indices. Provides detailed log information and summary.',
+        'input_schema': SearchLogsByKeywordArgs.model_json_schema(),
+        'args_model': SearchLogsByKeywordArgs,
+        'function': _handle_search_by_keyword,
+    },
+    'search_logs_advanced': {
+        'description': 'Advanced log search with custom OpenSearch query DSL for complex searches',
+        'input_schema': SearchLogsAdvancedArgs.model_json_schema(),
+        'args_model': SearchLogsAdvancedArgs,
+        'function': _handle_search_advanced,
+    },
+    'list_log_indices': {
+        'description': 'List all available log indices in the cluster',
+        'input_schema': ListLogIndicesArgs.model_json_schema(),
+        'args_model': ListLogIndicesArgs,
+        'function': _handle_list_indices,
+    },
+    'cluster_health': {
+        'description': 'Get cluster health information',
+        'input_schema': ClusterHealthArgs.model_json_schema(),
+        'args_model': ClusterHealthArgs,
+        'function': _handle_cluster_health,
+    },
+})
+
+_TOOLS_LIST = tuple(
+    Tool(
+        name=tool_name,
+        description=tool_info['description'],
+        inputSchema=tool_info['input_schema'],
+    )
+    for tool_name, tool_info in _TOOLS_INFO.items()
+)
 
 
 async def create_simple_local_server() -> Server:
     """Create a simple MCP server with log search capabilities"""
+    return build_simple_local_server()
+
+
+def build_simple_local_server() -> Server:
+    """Synchronously build the log search MCP server (usable outside an event loop)"""
     load_env_config()
     
     opensearch_url = os.getenv('OPENSEARCH_URL', 'http://localhost:9200')
@@ -106,252 +509,43 @@ async def create_simple_local_server() -> Server:
     
     server = Server('opensearch-log-search-server')
     
-    # Define tools focused on log searching
-    tools_info = {
-        'search_logs_by_keyword': {
-            'description': 'Search for logs containing specific keywords across indices. Provides detailed log information and summary.',
-            'input_schema': {
-                'type': 'object',
-                'properties': {
-                    'keyword': {
-                        'type': 'string', 
-                        'description': 'Keyword to search for in log messages (e.g., "authentication", "error", "failed")'
-                    },
-                    'index_pattern': {
-                        'type': 'string', 
-                        'description': 'Index pattern to search in (e.g., "agent-inventory-log-*", "*", or specific index name)',
-                        'default': '*'
-                    },
-                    'size': {
-                        'type': 'integer', 
-                        'description': 'Number of results to return (default: 10, max: 100)',
-                        'default': 10
-                    },
-                    'time_range': {
-                        'type': 'string',
-                        'description': 'Time range for search (e.g., "1h", "24h", "7d"). Optional.',
-                        'default': ''
-                    }
-                },
-                'required': ['keyword']
-            }
-        },
-        'search_logs_advanced': {
-            'description': 'Advanced log search with custom OpenSearch query DSL for complex searches',
-            'input_schema': {
-                'type': 'object',
-                'properties': {
-                    'index_pattern': {
-                        'type': 'string', 
-                        'description': 'Index pattern to search in',
-                        'default': '*'
-                    },
-                    'query': {
-                        'type': 'object', 
-                        'description': 'OpenSearch query DSL for complex searches'
-                    },
-                    'size': {
-                        'type': 'integer', 
-                        'description': 'Number of results to return (default: 10)',
-                        'default': 10
-                    }
-                },
-                'required': ['query']
-            }
-        },
-        'list_log_indices': {
-            'description': 'List all available log indices in the cluster',
-            'input_schema': {
-                'type': 'object',
-                'properties': {
-                    'pattern': {
-                        'type': 'string',
-                        'description': 'Filter indices by pattern (e.g., "log", "agent")',
-                        'default': ''
-                    }
-                },
-                'required': []
-            }
-        },
-        'cluster_health': {
-            'description': 'Get cluster health information',
-            'input_schema': {
-                'type': 'object',
-                'properties': {},
-                'required': []
-            }
-        }
-    }
-
     @server.list_tools()
     async def list_tools() -> list[Tool]:
-        tools = []
-        for tool_name, tool_info in tools_info.items():
-            tools.append(
-                Tool(
-                    name=tool_name,
-                    description=tool_info['description'],
-                    inputSchema=tool_info['input_schema'],
-                )
-            )
-        return tools
+        return list(_TOOLS_LIST)
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+        tool = _TOOLS_INFO.get(name)
+        if not tool:
+            raise ValueError(f'Unknown tool: {name}')
         try:
-            client = get_local_opensearch_client()
-            
-            if name == 'search_logs_by_keyword':
-                keyword = arguments.get('keyword')
-                index_pattern = arguments.get('index_pattern', '*')
-                size = min(arguments.get('size', 10), 100)  # Cap at 100
-                time_range = arguments.get('time_range', '')
-                
-                if not keyword:
-                    raise ValueError("'keyword' is required for log search")
-                
-                # Build query
-                query = {
-                    "query": {
-                        "bool": {
-                            "should": [
-                                {"match": {"message": keyword}},
-                                {"match": {"msg": keyword}},
-                                {"match": {"log": keyword}},
-                                {"wildcard": {"message": f"*{keyword}*"}},
-                                {"wildcard": {"msg": f"*{keyword}*"}},
-                                {"wildcard": {"log": f"*{keyword}*"}}
-                            ],
-                            "minimum_should_match": 1
-                        }
-                    },
-                    "size": size,
-                    "sort": [{"@timestamp": {"order": "desc"}}]
-                }
-                
-                # Add time range if specified
-                if time_range:
-                    query["query"]["bool"]["filter"] = [{
-                        "range": {
-                            "@timestamp": {
-                                "gte": f"now-{time_range}"
-                            }
-                        }
-                    }]
-                
-                response = client.search(index=index_pattern, body=query)
-                hits = response.get('hits', {}).get('hits', [])
-                
-                formatted_result = format_log_search_results(hits, keyword)
-                return [TextContent(type='text', text=formatted_result)]
-                
-            elif name == 'search_logs_advanced':
-                index_pattern = arguments.get('index_pattern', '*')
-                query = arguments.get('query')
-                size = arguments.get('size', 10)
-                
-                if not query:
-                    raise ValueError("'query' is required for advanced search")
-                
-                # Ensure size is set in query
-                if 'size' not in query:
-                    query['size'] = size
-                
-                response = client.search(index=index_pattern, body=query)
-                return [TextContent(type='text', text=json.dumps(response, indent=2))]
-                
-            elif name == 'list_log_indices':
-                pattern = arguments.get('pattern', '')
-                response = client.cat.indices(format='json')
-                
-                if pattern:
-                    # Filter indices containing the pattern
-                    filtered_indices = [idx for idx in response if pattern.lower() in idx.get('index', '').lower()]
-                    response = filtered_indices
-                
-                # Format for better readability
-                if response:
-                    result = "Available indices:\n\n"
-                    for idx in response:
-                        index_name = idx.get('index', 'N/A')
-                        doc_count = idx.get('docs.count', 'N/A')
-                        size = idx.get('store.size', 'N/A')
-                        result += f"• {index_name} (docs: {doc_count}, size: {size})\n"
-                else:
-                    result = "No indices found matching the pattern."
-                
-                return [TextContent(type='text', text=result)]
-                
-            elif name == 'cluster_health':
-                response = client.cluster.health()
-                return [TextContent(type='text', text=json.dumps(response, indent=2))]
-                
-            else:
-                raise ValueError(f'Unknown tool: {name}')
-                
-        except Exception as e:
-            return [TextContent(
-                type='text',
-                text=f'Error executing {name}: {str(e)}'
-            )]
+            # Validate once and fill defaults, so the handlers can index directly
+            arguments = tool['args_model'](**arguments).model_dump()
+        except ValidationError as e:
+            return _error_result(name, e)
+        return await tool['function'](arguments, get_local_opensearch_client())
 
     return server
 
 
-class SimpleMCPStarletteApp:
+class SimpleMCPStarletteApp(MCPStarletteApp):
     """Simple Starlette app for local OpenSearch log search"""
-    
-    def __init__(self, mcp_server: Server):
-        self.mcp_server = mcp_server
-        self.sse = SseServerTransport('/messages/')
-        self.session_manager = StreamableHTTPSessionManager(
-            app=self.mcp_server,
-            event_store=None,
-            json_response=False,
-            stateless=False,
-        )
 
-    async def handle_sse(self, request: Request) -> None:
-        async with self.sse.connect_sse(
-            request.scope,
-            request.receive,
-            request._send,
-        ) as (read_stream, write_stream):
-            await self.mcp_server.run(
-                read_stream,
-                write_stream,
-                self.mcp_server.create_initialization_options(),
-            )
-        return Response()
-
-    async def handle_health(self, request: Request) -> Response:
-        """Health check endpoint"""
-        return Response('OpenSearch Log Search MCP Server - OK', status_code=200)
-
-    @contextlib.asynccontextmanager
-    async def lifespan(self, app: Starlette) -> AsyncIterator[None]:
-        """Context manager for session manager lifecycle"""
-        async with self.session_manager.run():
-            logging.info('OpenSearch Log Search MCP Server started!')
-            try:
-                yield
-            finally:
-                logging.info('OpenSearch Log Search MCP Server shutting down...')
-
-    async def handle_streamable_http(self, scope: Scope, receive: Receive, send: Send) -> None:
-        """Handle streamable HTTP requests"""
-        await self.session_manager.handle_request(scope, receive, send)
-
-    def create_app(self) -> Starlette:
-        return Starlette(
-            routes=[
-                Route('/sse', endpoint=self.handle_sse, methods=['GET']),
-                Route('/health', endpoint=self.handle_health, methods=['GET']),
-                Mount('/messages/', app=self.sse.handle_post_message),
-                Mount('/mcp', app=self.handle_streamable_http),
-            ],
-            lifespan=self.lifespan,
-        )
+    health_message = 'OpenSearch Log Search MCP Server - OK'
+    server_label = 'OpenSearch Log Search MCP Server'
+
+    async def on_shutdown(self) -> None:
+        """Close the shared OpenSearch client"""
+        await close_local_opensearch_client()
+
+
+def app_factory() -> Starlette:
+    """Build the Starlette app; imported by each Uvicorn worker process.
+
+    Requests from one client can reach any worker, so the app keeps no sessions:
+    streamable HTTP runs stateless and SSE is refused.
+    """
+    return SimpleMCPStarletteApp(build_simple_local_server(), stateless=True).create_app()
 
 
 async def serve_simple_local(
@@ -359,6 +553,8 @@ async def serve_simple_local(
     port: int = 9900,
 ) -> None:
     """Start the simple local OpenSearch log search MCP streaming server"""
+    import uvicorn
+
     logging.basicConfig(level=logging.INFO)
     logging.info(f"Starting OpenSearch Log Search MCP Server on {host}:{port}")
     
@@ -366,16 +562,53 @@ async def serve_simple_local(
     app_handler = SimpleMCPStarletteApp(mcp_server)
     app = app_handler.create_app()
 
+    # The 'auto' HTTP parser picks httptools when the 'speed' extra is installed.
+    # serve() runs on the caller's loop, which is uvloop only if the caller set its
+    # policy (as __main__ does); websockets are never served here
     config = uvicorn.Config(
         app=app,
         host=host,
         port=port,
-        log_level="info"
+        **uvicorn_log_options(),
+        ws='none',
     )
     server = uvicorn.Server(config)
     await server.serve()
 
 
+def run_simple_local(
+    host: str = '0.0.0.0',
+    port: int = 9900,
+    workers: int = 0,
+) -> None:
+    """Run the log search server, spreading it over MCP_WORKERS processes if set.
+
+    With more than one worker only stateless streamable HTTP (/mcp) is served.
+    """
+    workers = workers or int(os.getenv('MCP_WORKERS', '1'))
+    if workers > 1:
+        import uvicorn
+
+        logging.basicConfig(level=logging.INFO)
+        logging.info(f'Running {workers} workers: stateless /mcp only, SSE is disabled')
+        uvicorn.run(
+            'mcp_server_opensearch.simple_local_server:app_factory',
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+            **uvicorn_log_options(),
+            ws='none',
+        )
+    else:
+        asyncio.run(serve_simple_local(host, port))
+
+
 if __name__ == '__main__':
-    import asyncio
-    asyncio.run(serve_simple_local())
\ No newline at end of file
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    run_simple_local()
\ No newline at end of file
@@ -0,0 +1,128 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import logging
+import os
+from functools import cached_property
+from mcp.server import Server
+from mcp.server.models import InitializationOptions
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from starlette.types import Receive, Scope, Send
+from typing import Any, AsyncIterator, Dict
+
+
+class MCPStarletteApp:
+    """Starlette app serving an MCP server over SSE and streamable HTTP.
+
+    Subclasses customize the health check response and log messages through the
+    class attributes, and can release resources by overriding on_shutdown.
+
+    Sessions live in the memory of one process. An app served by several worker
+    processes must be stateless: streamable HTTP then treats every request on its
+    own, and SSE, whose messages must reach the process holding the stream, is
+    refused.
+    """
+
+    health_message = 'OK'
+    server_label = 'Application'
+
+    def __init__(self, mcp_server: Server, stateless: bool = False):
+        from mcp.server.sse import SseServerTransport
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+        self.mcp_server = mcp_server
+        self.stateless = stateless
+        self.sse = SseServerTransport('/messages/')
+        self.session_manager = StreamableHTTPSessionManager(
+            app=self.mcp_server,
+            event_store=None,
+            json_response=False,
+            stateless=stateless,
+        )
+
+    @cached_property
+    def initialization_options(self) -> InitializationOptions:
+        """Initialization options shared by every SSE connection."""
+        return self.mcp_server.create_initialization_options()
+
+    async def handle_sse(self, request: Request) -> None:
+        async with self.sse.connect_sse(
+            request.scope,
+            request.receive,
+            request._send,
+        ) as (read_stream, write_stream):
+            await self.mcp_server.run(
+                read_stream,
+                write_stream,
+                self.initialization_options,
+            )
+
+        # Done to prevent 'NoneType' errors. For more details: https://github.com/modelcontextprotocol/python-sdk/blob/main/src/mcp/server/sse.py#L33-L37
+        return Response()
+
+    async def handle_sse_unavailable(self, request: Request) -> Response:
+        """Refuse SSE connections on a stateless (multi-process) app."""
+        return Response(
+            'SSE transport requires a single server process; use the /mcp endpoint',
+            status_code=501,
+        )
+
+    async def handle_health(self, request: Request) -> Response:
+        return Response(self.health_message, status_code=200)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app: Starlette) -> AsyncIterator[None]:
+        """
+        Context manager for session manager lifecycle.
+        Ensures proper startup and shutdown of the session manager.
+        """
+        async with self.session_manager.run():
+            logging.info(f'{self.server_label} started with StreamableHTTP session manager!')
+            try:
+                yield
+            finally:
+                logging.info(f'{self.server_label} shutting down...')
+                await self.on_shutdown()
+
+    async def on_shutdown(self) -> None:
+        """Release resources held by the app; called when the app stops."""
+
+    async def handle_streamable_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle streamable HTTP requests."""
+        await self.session_manager.handle_request(scope, receive, send)
+
+    def create_app(self) -> Starlette:
+        if self.stateless:
+            sse_route = Route('/sse', endpoint=self.handle_sse_unavailable, methods=['GET'])
+            messages_route = Mount(
+                '/messages/',
+                routes=[Route('/', endpoint=self.handle_sse_unavailable, methods=['POST'])],
+            )
+        else:
+            sse_route = Route('/sse', endpoint=self.handle_sse, methods=['GET'])
+            messages_route = Mount('/messages/', app=self.sse.handle_post_message)
+        return Starlette(
+            routes=[
+                sse_route,
+                Route('/health', endpoint=self.handle_health, methods=['GET']),
+                messages_route,
+                Mount('/mcp', app=self.handle_streamable_http),
+            ],
+            lifespan=self.lifespan,
+        )
+
+
+def uvicorn_log_options() -> Dict[str, Any]:
+    """Return Uvicorn logging settings from MCP_LOG_LEVEL and MCP_ACCESS_LOG.
+
+    Access logging is off unless MCP_ACCESS_LOG is enabled, so requests do not pay
+    for formatting a log record each.
+    """
+    return {
+        'log_level': os.getenv('MCP_LOG_LEVEL', 'info').lower(),
+        'access_log': os.getenv('MCP_ACCESS_LOG', '0').lower() in ('1', 'true', 'yes'),
+    }
@@ -4,31 +4,107 @@
 import boto3
 import logging
 import os
-from mcp_server_opensearch.clusters_information import ClusterInfo, get_cluster
-from opensearchpy import OpenSearch, RequestsHttpConnection
 import ssl
+import threading
 import urllib3
-
-# Force disable SSL warnings and verification globally
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-ssl._create_default_https_context = ssl._create_unverified_context
+import weakref
+from botocore.credentials import (
+    AssumeRoleCredentialFetcher,
+    DeferredRefreshableCredentials,
+    JSONFileCache,
+)
+from functools import lru_cache, partial
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry, get_cluster
+from opensearchpy import OpenSearch, RequestsHttpConnection
 from requests_aws4auth import AWS4Auth
 from tools.tool_params import baseToolArgs
-from typing import Any, Dict
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Constants
 OPENSEARCH_SERVICE = 'es'
 OPENSEARCH_SERVERLESS_SERVICE = 'aoss'
+DEFAULT_POOL_MAXSIZE = 32
+
+# Sentinel for attributes an object does not have
+_MISSING = object()
 
 # global profile variable from command line
 arg_profile = None
 
+# SSL context that ignores certificate errors, shared by all clients with verify_certs off
+_INSECURE_SSL_CONTEXT = ssl.create_default_context()
+_INSECURE_SSL_CONTEXT.check_hostname = False
+_INSECURE_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+# Clients reused across tool calls, keyed by their connection settings
+_CLIENT_CACHE: Dict[tuple, OpenSearch] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+# Returns the http_auth for a client, or None to send requests without authentication
+AuthStrategy = Callable[[], Any]
+# Authentication method chosen per cluster settings, so the credential provider
+# chain (which can reach IMDS) is only walked once per cluster
+_AUTH_STRATEGY_CACHE: Dict[tuple, AuthStrategy] = {}
+# Clients whose authentication fell back after an error; never cached, so the
+# preferred method is retried on the next call
+_FALLBACK_CLIENTS: 'weakref.WeakSet[OpenSearch]' = weakref.WeakSet()
+# Clients for registry clusters by name, with the ClusterInfo they were built from
+_CLUSTER_CLIENTS: Dict[str, Tuple[ClusterInfo, OpenSearch]] = {}
+# Cluster used when a tool call names none, resolved from the registry on first use
+_DEFAULT_CLUSTER_NAME: Optional[str] = None
+_DEFAULT_CLUSTER: Optional[ClusterInfo] = None
+# Registry clusters without a URL, with the ClusterInfo that failed validation
+_KNOWN_BAD: Dict[str, ClusterInfo] = {}
+_EMPTY_URL_MSG = (
+    'OpenSearch URL must be provided using config file or OPENSEARCH_URL environment variable'
+)
+# Assumed-role credentials are shared with the AWS CLI cache, so they survive restarts
+AWS_CLI_CACHE_DIR = os.path.expanduser(os.path.join('~', '.aws', 'cli', 'cache'))
+
+
+def configure_client_module(insecure_ssl: bool = False) -> None:
+    """Apply process-wide logging and SSL settings; called by server entry points.
+
+    Importing this module has no side effects, so embedders keep their own logging
+    and SSL configuration.
+
+    Args:
+        insecure_ssl: Disable certificate verification and its warnings for every
+            HTTPS connection in the process, not only OpenSearch clients
+    """
+    logging.basicConfig(level=logging.INFO)
+    if insecure_ssl:
+        ssl._create_default_https_context = ssl._create_unverified_context
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+@lru_cache(maxsize=1)
+def _env_snapshot() -> SimpleNamespace:
+    """Return the client settings read from the environment, read once until refresh_env()."""
+    return SimpleNamespace(
+        url=os.getenv('OPENSEARCH_URL', ''),
+        username=os.getenv('OPENSEARCH_USERNAME', ''),
+        password=os.getenv('OPENSEARCH_PASSWORD', ''),
+        iam_arn=os.getenv('AWS_IAM_ARN', ''),
+        region=os.getenv('AWS_REGION', ''),
+        profile=os.getenv('AWS_PROFILE', ''),
+        serverless=os.getenv('AWS_OPENSEARCH_SERVERLESS', '').lower() == 'true',
+        verify_certs=os.getenv('OPENSEARCH_SSL_VERIFY', 'true').lower() != 'false',
+        pool_maxsize=int(os.getenv('OPENSEARCH_POOL_MAXSIZE', str(DEFAULT_POOL_MAXSIZE))),
+    )
+
+
+def refresh_env() -> None:
+    """Re-read the client settings from the environment on the next client build.
+
+    Call this after changing any of the OPENSEARCH_* or AWS_* variables at runtime.
+    """
+    _env_snapshot.cache_clear()
+
 
 def set_profile(profile: str) -> None:
     global arg_profile
@@ -44,22 +120,173 @@ def is_serverless(args_or_cluster_info: baseToolArgs | ClusterInfo | None = None
     Returns:
         bool: True if serverless, False otherwise
     """
-    cluster_info = None
+    # Tool arguments name a cluster in the registry
+    cluster_name = getattr(args_or_cluster_info, 'opensearch_cluster_name', None)
+    if cluster_name:
+        cluster_info = get_cluster(cluster_name)
+        if cluster_info:
+            return bool(cluster_info.is_serverless)
+    else:
+        # Cluster information carries the flag itself, even when unset
+        flag = getattr(args_or_cluster_info, 'is_serverless', _MISSING)
+        if flag is not _MISSING:
+            return bool(flag)
 
-    # Handle baseToolArgs input
-    if isinstance(args_or_cluster_info, baseToolArgs):
-        if args_or_cluster_info and args_or_cluster_info.opensearch_cluster_name:
-            cluster_info = get_cluster(args_or_cluster_info.opensearch_cluster_name)
-    # Handle ClusterInfo input
-    elif isinstance(args_or_cluster_info, ClusterInfo):
-        cluster_info = args_or_cluster_info
+    # If cluster_info is not provided, check the environment variable
+    return _env_snapshot().serverless
 
-    # Check cluster_info first
-    if cluster_info:
-        return cluster_info.is_serverless
 
-    # If cluster_info is not provided, check the environment variable
-    return os.getenv('AWS_OPENSEARCH_SERVERLESS', '').lower() == 'true'
+@lru_cache(maxsize=8)
+def _get_boto_session(profile: str) -> boto3.Session:
+    """Return the shared boto3 session for a profile, creating it on first use.
+
+    Args:
+        profile: AWS profile name, or an empty string for the default credential chain
+
+    Returns:
+        boto3.Session: Session used only to read credentials and create clients
+    """
+    return boto3.Session(profile_name=profile) if profile else boto3.Session()
+
+
+def _assume_role_fetcher(
+    session: boto3.Session, iam_arn: str, aws_region: str
+) -> AssumeRoleCredentialFetcher:
+    """Create a fetcher for IAM role credentials backed by the AWS CLI credential cache.
+
+    Args:
+        session: boto3 session providing the source credentials
+        iam_arn: ARN of the IAM role to assume
+        aws_region: Region of the STS endpoint
+
+    Returns:
+        AssumeRoleCredentialFetcher: Fetcher that only calls STS when the cached credentials expire
+    """
+    return AssumeRoleCredentialFetcher(
+        client_creator=partial(session.client, region_name=aws_region),
+        source_credentials=session.get_credentials(),
+        role_arn=iam_arn,
+        extra_args={'RoleSessionName': 'OpenSearchClientSession'},
+        cache=JSONFileCache(AWS_CLI_CACHE_DIR),
+    )
+
+
+def _cache_client(key: tuple, client: OpenSearch) -> OpenSearch:
+    """Store a client in the client cache and return it."""
+    with _CLIENT_CACHE_LOCK:
+        _CLIENT_CACHE[key] = client
+    return client
+
+
+def _iam_auth_factory(
+    session: boto3.Session, iam_arn: str, aws_region: str, service_name: str
+) -> AuthStrategy:
+    """Sign requests with refreshable credentials for an assumed IAM role."""
+    if not aws_region:
+        raise RuntimeError('AWS region not found, please specify region using `aws configure`')
+
+    fetcher = _assume_role_fetcher(session, iam_arn, aws_region)
+    credentials = DeferredRefreshableCredentials(
+        method='assume-role', refresh_using=fetcher.fetch_credentials
+    )
+    # Fetch now so a role that cannot be assumed falls through to the next method
+    credentials.get_frozen_credentials()
+
+    aws_auth = AWS4Auth(
+        refreshable_credentials=credentials,
+        service=service_name,
+        region=aws_region,
+    )
+    return lambda: aws_auth
+
+
+def _basic_auth_factory(username: str, password: str) -> AuthStrategy:
+    """Authenticate with a username and password."""
+    return lambda: (username, password)
+
+
+def _boto_creds_factory(
+    session: boto3.Session, aws_region: str, service_name: str
+) -> Optional[AuthStrategy]:
+    """Sign requests with the session's credentials, or return None if it has none."""
+    credentials = session.get_credentials()
+    if not credentials:
+        return None
+    if not aws_region:
+        raise RuntimeError('AWS region not found, please specify region using `aws configure`')
+
+    aws_auth = AWS4Auth(
+        refreshable_credentials=credentials,
+        service=service_name,
+        region=aws_region,
+    )
+    return lambda: aws_auth
+
+
+def _no_auth_factory() -> AuthStrategy:
+    """Send requests without authentication."""
+    return lambda: None
+
+
+def _resolve_auth_strategy(
+    iam_arn: str,
+    opensearch_username: str,
+    opensearch_password: str,
+    profile: str,
+    aws_region: str,
+    service_name: str,
+) -> Tuple[AuthStrategy, bool]:
+    """Pick the first authentication method that works for a cluster.
+
+    Methods are tried in order: IAM role, basic authentication, boto3 session
+    credentials, then no authentication. A method that raised may only have failed
+    transiently (e.g. an STS or IMDS timeout), so a choice made after such a failure
+    is reported as not reusable.
+
+    Args:
+        iam_arn: IAM role to assume, if any
+        opensearch_username: Username for basic authentication
+        opensearch_password: Password for basic authentication
+        profile: AWS profile for the boto3 session
+        aws_region: AWS region, or an empty string to use the session's region
+        service_name: Service name used to sign AWS requests
+
+    Returns:
+        Tuple[AuthStrategy, bool]: Callable returning the http_auth for the client, and
+        whether the choice may be cached (no method failed with an error)
+    """
+    session = _get_boto_session(profile)
+    if not aws_region:
+        aws_region = session.region_name or _env_snapshot().region
+
+    # 1. Try IAM auth
+    failed = False
+    if iam_arn:
+        logger.info('[IAM AUTH] Using IAM role authentication: %s', iam_arn)
+        try:
+            return _iam_auth_factory(session, iam_arn, aws_region, service_name), True
+        except Exception as e:
+            logger.error('[IAM AUTH] Failed to assume IAM role %s: %s', iam_arn, e)
+            failed = True
+
+    # 2. Try basic auth
+    if opensearch_username and opensearch_password:
+        logger.info('[BASIC AUTH] Using basic authentication: %s', opensearch_username)
+        return _basic_auth_factory(opensearch_username, opensearch_password), not failed
+
+    # 3. Try to get credentials from boto3 session
+    try:
+        logger.info('[AWS CREDS] Using AWS credentials authentication')
+        strategy = _boto_creds_factory(session, aws_region, service_name)
+        if strategy is not None:
+            return strategy, not failed
+    except (boto3.exceptions.Boto3Error, Exception) as e:
+        logger.error('[AWS CREDS] Failed to get AWS credentials: %s', e)
+        failed = True
+
+    # 4. Try no authentication (for local development)
+    logger.info('[NO AUTH] Using no authentication (local development mode)')
+    return _no_auth_factory(), not failed
 
 
 def initialize_client_with_cluster(cluster_info: ClusterInfo = None) -> OpenSearch:
@@ -71,6 +298,10 @@ def initialize_client_with_cluster(cluster_info: ClusterInfo = None) -> OpenSear
        - Uses 'aoss' service name if OPENSEARCH_SERVERLESS=true
        - Uses 'es' service name otherwise
 
+    Clients are cached per connection settings, so repeated calls for the same cluster
+    reuse one client and its connection pool. A client whose authentication fell back
+    after an error is not cached, so the next call retries the preferred method.
+
     Args:
         cluster_info (ClusterInfo): Cluster information object containing authentication and connection details
 
@@ -81,24 +312,17 @@ def initialize_client_with_cluster(cluster_info: ClusterInfo = None) -> OpenSear
         ValueError: If opensearch_url is empty or invalid
         RuntimeError: If no valid authentication method is available
     """
-    opensearch_url = (
-        cluster_info.opensearch_url if cluster_info else os.getenv('OPENSEARCH_URL', '')
-    )
+    env = _env_snapshot()
+    opensearch_url = cluster_info.opensearch_url if cluster_info else env.url
     if not opensearch_url:
-        raise ValueError(
-            'OpenSearch URL must be provided using config file or OPENSEARCH_URL environment variable'
-        )
-    opensearch_username = (
-        cluster_info.opensearch_username if cluster_info else os.getenv('OPENSEARCH_USERNAME', '')
-    )
-    opensearch_password = (
-        cluster_info.opensearch_password if cluster_info else os.getenv('OPENSEARCH_PASSWORD', '')
-    )
+        raise ValueError(_EMPTY_URL_MSG)
+    opensearch_username = cluster_info.opensearch_username if cluster_info else env.username
+    opensearch_password = cluster_info.opensearch_password if cluster_info else env.password
     aws_region = cluster_info.aws_region if cluster_info else ''
-    iam_arn = cluster_info.iam_arn if cluster_info else os.getenv('AWS_IAM_ARN', '')
+    iam_arn = cluster_info.iam_arn if cluster_info else env.iam_arn
     profile = cluster_info.profile if cluster_info else arg_profile
     if not profile:
-        profile = os.getenv('AWS_PROFILE', '')
+        profile = env.profile
 
     # Check if using OpenSearch Serverless
     is_serverless_mode = is_serverless(cluster_info)
@@ -114,12 +338,27 @@ def initialize_client_with_cluster(cluster_info: ClusterInfo = None) -> OpenSear
     verify_certs = True  # Default to True for security
     if cluster_info and cluster_info.verify_certs is not None:
         verify_certs = cluster_info.verify_certs
-        logger.info(f'[SSL] Using cluster verify_certs setting: {verify_certs}')
+        logger.info('[SSL] Using cluster verify_certs setting: %s', verify_certs)
     else:
-        verify_certs = os.getenv('OPENSEARCH_SSL_VERIFY', 'true').lower() != 'false'
-        logger.info(f'[SSL] Using environment verify_certs setting: {verify_certs}')
-    
-    logger.info(f'[SSL] Final verify_certs setting: {verify_certs} for URL: {opensearch_url}')
+        verify_certs = env.verify_certs
+        logger.info('[SSL] Using environment verify_certs setting: %s', verify_certs)
+
+    logger.info('[SSL] Final verify_certs setting: %s for URL: %s', verify_certs, opensearch_url)
+
+    cache_key = (
+        opensearch_url,
+        opensearch_username,
+        opensearch_password,
+        iam_arn,
+        profile,
+        aws_region or env.region,
+        verify_certs,
+        is_serverless_mode,
+    )
+    with _CLIENT_CACHE_LOCK:
+        cached = _CLIENT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
     # Common client configuration
     client_kwargs: Dict[str, Any] = {
@@ -127,97 +366,118 @@ def initialize_client_with_cluster(cluster_info: ClusterInfo = None) -> OpenSear
         'use_ssl': (parsed_url.scheme == 'https'),
         'verify_certs': verify_certs,
         'connection_class': RequestsHttpConnection,
+        # Keep enough pooled connections for concurrent tool calls; requests
+        # otherwise keeps a pool of 10 and reconnects (and re-handshakes) on overflow
+        'pool_maxsize': env.pool_maxsize,
+        'max_retries': 3,
+        'retry_on_timeout': True,
     }
-    
+
     # Additional SSL configuration when verify_certs is False (equivalent to curl -k)
     if not verify_certs and parsed_url.scheme == 'https':
-        import ssl
-        import urllib3
         logger.info('[SSL] Applying SSL bypass configuration (equivalent to curl -k)')
-        
-        # Disable SSL warnings when verification is disabled
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
+
         # For OpenSearch-py 3.0.0, use ssl_assert_hostname and ssl_assert_fingerprint
         client_kwargs['ssl_assert_hostname'] = False
         client_kwargs['ssl_assert_fingerprint'] = None
-        
-        # Create SSL context that ignores certificate errors
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        # Add SSL context to client configuration
-        client_kwargs['ssl_context'] = ssl_context
+
+        # Shared SSL context that ignores certificate errors
+        client_kwargs['ssl_context'] = _INSECURE_SSL_CONTEXT
         client_kwargs['ssl_show_warn'] = False
-        
-        logger.info(f'[SSL] SSL bypass configuration applied: ssl_context.verify_mode = {ssl_context.verify_mode}')
-        logger.info(f'[SSL] Client kwargs: {list(client_kwargs.keys())}')
 
-    session = boto3.Session(profile_name=profile) if profile else boto3.Session()
-    if not aws_region:
-        aws_region = session.region_name or os.getenv('AWS_REGION', '')
+        logger.info(
+            '[SSL] SSL bypass configuration applied: ssl_context.verify_mode = %s',
+            _INSECURE_SSL_CONTEXT.verify_mode,
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('[SSL] Client kwargs: %s', list(client_kwargs.keys()))
+
+    auth_key = (
+        iam_arn,
+        opensearch_username,
+        opensearch_password,
+        profile,
+        aws_region or env.region,
+        is_serverless_mode,
+    )
+    with _CLIENT_CACHE_LOCK:
+        strategy = _AUTH_STRATEGY_CACHE.get(auth_key)
+    reusable = True
+    if strategy is None:
+        strategy, reusable = _resolve_auth_strategy(
+            iam_arn, opensearch_username, opensearch_password, profile, aws_region, service_name
+        )
+        if reusable:
+            with _CLIENT_CACHE_LOCK:
+                _AUTH_STRATEGY_CACHE[auth_key] = strategy
 
-    # 1. Try IAM auth
-    if iam_arn:
-        logger.info(f'[IAM AUTH] Using IAM role authentication: {iam_arn}')
-        try:
-            if not aws_region:
-                raise RuntimeError(
-                    'AWS region not found, please specify region using `aws configure`'
-                )
-
-            sts_client = session.client('sts', region_name=aws_region)
-            assumed_role = sts_client.assume_role(
-                RoleArn=iam_arn, RoleSessionName='OpenSearchClientSession'
-            )
-            credentials = assumed_role['Credentials']
-
-            aws_auth = AWS4Auth(
-                credentials['AccessKeyId'],
-                credentials['SecretAccessKey'],
-                aws_region,
-                service_name,
-                session_token=credentials['SessionToken'],
-            )
-            client_kwargs['http_auth'] = aws_auth
-            return OpenSearch(**client_kwargs)
-        except Exception as e:
-            logger.error(f'[IAM AUTH] Failed to assume IAM role {iam_arn}: {str(e)}')
+    http_auth = strategy()
+    if http_auth is not None:
+        client_kwargs['http_auth'] = http_auth
+    client = OpenSearch(**client_kwargs)
+    if not reusable:
+        _FALLBACK_CLIENTS.add(client)
+        return client
+    return _cache_client(cache_key, client)
 
-    # 2. Try basic auth
-    if opensearch_username and opensearch_password:
-        logger.info(f'[BASIC AUTH] Using basic authentication: {opensearch_username}')
-        client_kwargs['http_auth'] = (opensearch_username, opensearch_password)
-        return OpenSearch(**client_kwargs)
 
-    # 3. Try to get credentials from boto3 session
-    try:
-        logger.info(f'[AWS CREDS] Using AWS credentials authentication')
-        credentials = session.get_credentials()
-        if not aws_region:
-            raise RuntimeError('AWS region not found, please specify region using `aws configure`')
-        if credentials:
-            aws_auth = AWS4Auth(
-                refreshable_credentials=credentials,
-                service=service_name,
-                region=aws_region,
-            )
-            client_kwargs['http_auth'] = aws_auth
-            return OpenSearch(**client_kwargs)
-    except (boto3.exceptions.Boto3Error, Exception) as e:
-        logger.error(f'[AWS CREDS] Failed to get AWS credentials: {str(e)}')
+def _get_or_build_client(name: str, cluster_info: ClusterInfo) -> OpenSearch:
+    """Return the client for a registry cluster, building it on first use.
 
-    # 4. Try no authentication (for local development)
-    logger.info('[NO AUTH] Using no authentication (local development mode)')
-    return OpenSearch(**client_kwargs)
+    The client is rebuilt when the cluster's registry entry has been replaced, or
+    when its authentication fell back after an error. Entries without a URL fail
+    fast until they are replaced.
+
+    Args:
+        name: Cluster name in the registry
+        cluster_info: Current registry entry for the cluster
+
+    Returns:
+        OpenSearch: The client for the cluster
+    """
+    entry = _CLUSTER_CLIENTS.get(name)
+    if entry is not None and entry[0] is cluster_info:
+        return entry[1]
+    if _KNOWN_BAD.get(name) is cluster_info:
+        raise ValueError(_EMPTY_URL_MSG)
+    if not cluster_info.opensearch_url:
+        _KNOWN_BAD[name] = cluster_info
+        raise ValueError(_EMPTY_URL_MSG)
+    _KNOWN_BAD.pop(name, None)
+    client = initialize_client_with_cluster(cluster_info)
+    if client not in _FALLBACK_CLIENTS:
+        _CLUSTER_CLIENTS[name] = (cluster_info, client)
+    return client
+
+
+def _default_cluster() -> Tuple[Optional[str], Optional[ClusterInfo]]:
+    """Return the first registry cluster, used when a tool call names no cluster.
+
+    The choice is remembered until its registry entry is removed or replaced.
+
+    Returns:
+        Tuple[Optional[str], Optional[ClusterInfo]]: The cluster name and information,
+        or (None, None) if the registry is empty
+    """
+    global _DEFAULT_CLUSTER_NAME, _DEFAULT_CLUSTER
+    current = cluster_registry.get(_DEFAULT_CLUSTER_NAME) if _DEFAULT_CLUSTER_NAME else None
+    if current is not None and current is _DEFAULT_CLUSTER:
+        return _DEFAULT_CLUSTER_NAME, _DEFAULT_CLUSTER
+    if not cluster_registry:
+        _DEFAULT_CLUSTER_NAME = _DEFAULT_CLUSTER = None
+        return None, None
+    _DEFAULT_CLUSTER_NAME = next(iter(cluster_registry))
+    _DEFAULT_CLUSTER = cluster_registry[_DEFAULT_CLUSTER_NAME]
+    logger.info('No cluster specified, using first available cluster: %s', _DEFAULT_CLUSTER_NAME)
+    return _DEFAULT_CLUSTER_NAME, _DEFAULT_CLUSTER
 
 
 def initialize_client(args: baseToolArgs) -> OpenSearch:
     """Initialize and return an OpenSearch client with appropriate authentication.
 
     This function gets cluster information from the provided arguments and then
-    initializes the OpenSearch client using that information.
+    initializes the OpenSearch client using that information. Clients for clusters
+    from the registry are reused until the cluster's entry changes.
 
     Args:
         args (baseToolArgs): The arguments object containing authentication and connection details
@@ -229,14 +489,14 @@ def initialize_client(args: baseToolArgs) -> OpenSearch:
         ValueError: If opensearch_url is empty or invalid
         RuntimeError: If no valid authentication method is available
     """
+    cluster_name = None
     cluster_info = None
     if args and args.opensearch_cluster_name:
-        cluster_info = get_cluster(args.opensearch_cluster_name)
+        cluster_name = args.opensearch_cluster_name
+        cluster_info = get_cluster(cluster_name)
     else:
         # If no cluster name specified, use the first available cluster in multi-mode
-        from mcp_server_opensearch.clusters_information import cluster_registry
-        if cluster_registry:
-            first_cluster_name = next(iter(cluster_registry))
-            cluster_info = cluster_registry[first_cluster_name]
-            logger.info(f'No cluster specified, using first available cluster: {first_cluster_name}')
-    return initialize_client_with_cluster(cluster_info)
+        cluster_name, cluster_info = _default_cluster()
+    if cluster_info is None:
+        return initialize_client_with_cluster(None)
+    return _get_or_build_client(cluster_name, cluster_info)
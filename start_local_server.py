@@ -18,7 +18,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.join(current_dir, 'src')
 sys.path.insert(0, src_dir)
 
-from mcp_server_opensearch.simple_local_server import serve_simple_local
+from mcp_server_opensearch.simple_local_server import run_simple_local
 
 if __name__ == '__main__':
     print("Starting OpenSearch Log Search MCP Server...")
@@ -35,7 +35,14 @@ if __name__ == '__main__':
     print("Press Ctrl+C to stop the server")
     
     try:
-        asyncio.run(serve_simple_local())
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    try:
+        run_simple_local()
     except KeyboardInterrupt:
         print("\nServer stopped by user.")
     except Exception as e:
@@ -11,7 +11,6 @@ Usage:
 
 import os
 import sys
-import subprocess
 from pathlib import Path
 
 def main():
@@ -49,21 +48,15 @@ def main():
     print("")
     print("Press Ctrl+C to stop the server")
     
+    # Replace this process with the server, so signals such as Ctrl+C go
+    # straight to it and no parent interpreter stays alive
+    sys.stdout.flush()
     try:
-        # Execute the command
-        subprocess.run(cmd, env=env, check=True)
-    except KeyboardInterrupt:
-        print("\nServer stopped by user.")
-    except subprocess.CalledProcessError as e:
-        print(f"Error running server: {e}")
-        sys.exit(1)
+        os.execvpe(cmd[0], cmd, env)
     except FileNotFoundError as e:
         print(f"Error: {e}")
         print("Make sure the virtual environment is set up at .venv/")
         sys.exit(1)
-    except Exception as e:
-        print(f"Unexpected error: {e}")
-        sys.exit(1)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
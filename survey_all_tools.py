@@ -4,16 +4,40 @@ Survey all available MCP tools and their capabilities
 """
 
 import asyncio
+import contextvars
 import json
 import sys
 import os
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson comes with the optional 'speed' extra
+    orjson = None
+
 # Add src to path so we can import modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from mcp.client.streamable_http import streamablehttp_client
-from mcp.client.session import ClientSession
+from mcp_client_session import close_session, mcp_session, mentions
+
+def dumps_indented(obj):
+    """Serialize obj as indented JSON, using orjson when it is installed."""
+    if orjson is None:
+        return json.dumps(obj, indent=2)
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+# Lines buffered by the tool survey currently running in this task, if any
+_output = contextvars.ContextVar('output', default=None)
+
+
+def log(message=""):
+    """Print a line, or buffer it while the tool surveys run concurrently."""
+    buffer = _output.get()
+    if buffer is None:
+        print(message)
+    else:
+        buffer.append(message)
 
 
 async def survey_all_tools():
@@ -26,50 +50,66 @@ async def survey_all_tools():
     
     try:
         # Connect to MCP Server
-        async with streamablehttp_client("http://localhost:9900/mcp") as (read_stream, write_stream, _):
-            async with ClientSession(read_stream, write_stream) as session:
-                print("✅ Connected to MCP Server")
-                
-                # Initialize the session
-                await session.initialize()
-                print("✅ Session initialized")
-                
-                # Get server info
-                print("\n📊 Server Information:")
-                print("-" * 30)
-                
-                # List available tools
-                tools_response = await session.list_tools()
-                available_tools = tools_response.tools
-                
-                print(f"📊 Total tools available: {len(available_tools)}")
-                print(f"📊 Tool names: {[tool.name for tool in available_tools]}")
-                
-                # Survey each tool
-                for i, tool in enumerate(available_tools, 1):
-                    print(f"\n🔧 Tool {i}/{len(available_tools)}: {tool.name}")
-                    print("-" * 40)
-                    print(f"📝 Description: {tool.description}")
-                    print(f"📋 Input Schema: {json.dumps(tool.inputSchema, indent=2)}")
-                    
-                    # Test each tool based on its type
-                    await test_tool_functionality(session, tool)
-                    
-                    print()
-                
-                print("\n🎉 All tools survey completed!")
-                
+        async with mcp_session() as session:
+            print("✅ Connected to MCP Server")
+            print("✅ Session initialized")
+            
+            # Get server info
+            print("\n📊 Server Information:")
+            print("-" * 30)
+            
+            # List available tools
+            tools_response = await session.list_tools()
+            available_tools = tools_response.tools
+            
+            print(f"📊 Total tools available: {len(available_tools)}")
+            print(f"📊 Tool names: {[tool.name for tool in available_tools]}")
+            
+            # Survey the tools concurrently, then print each report in order
+            reports = await asyncio.gather(
+                *(
+                    survey_tool(session, tool, i, len(available_tools))
+                    for i, tool in enumerate(available_tools, 1)
+                ),
+                return_exceptions=True,
+            )
+            for tool, report in zip(available_tools, reports):
+                if isinstance(report, BaseException):
+                    print(f"\n❌ Error surveying {tool.name}: {report}")
+                else:
+                    print("\n".join(report))
+            
+            print("\n🎉 All tools survey completed!")
+            
     except Exception as e:
         print(f"❌ Error surveying tools: {e}")
         import traceback
         traceback.print_exc()
 
 
+async def survey_tool(session, tool, position, total):
+    """Describe and test one tool, returning its report lines."""
+    
+    buffer = []
+    # gather runs each survey in its own task, so this only affects this survey
+    _output.set(buffer)
+    log(f"\n🔧 Tool {position}/{total}: {tool.name}")
+    log("-" * 40)
+    log(f"📝 Description: {tool.description}")
+    log(f"📋 Input Schema: {dumps_indented(tool.inputSchema)}")
+    
+    # Test each tool based on its type
+    await test_tool_functionality(session, tool)
+    
+    log()
+    return buffer
+
+
 async def test_tool_functionality(session, tool):
     """Test basic functionality of each tool."""
     
     tool_name = tool.name
-    print(f"\n🧪 Testing {tool_name} functionality...")
+    log(f"\n🧪 Testing {tool_name} functionality...")
     
     try:
         # Test based on tool type
@@ -90,53 +130,53 @@ async def test_tool_functionality(session, tool):
         elif tool_name == "MsearchTool":
             await test_msearch_tool(session)
         else:
-            print(f"⚠️ Unknown tool type: {tool_name}")
+            log(f"⚠️ Unknown tool type: {tool_name}")
             
     except Exception as e:
-        print(f"❌ Error testing {tool_name}: {e}")
+        log(f"❌ Error testing {tool_name}: {e}")
 
 
 async def test_list_index_tool(session):
     """Test ListIndexTool functionality."""
     
-    print("   📋 Testing ListIndexTool...")
+    log("   📋 Testing ListIndexTool...")
     
     try:
         # Test 1: List all indices
         result = await session.call_tool("ListIndexTool", {})
-        print(f"   ✅ List all indices: Success")
-        print(f"   📊 Result preview: {result.content[0].text[:200]}...")
+        indices_text = result.content[0].text
+        log(f"   ✅ List all indices: Success")
+        log(f"   📊 Result preview: {indices_text[:200]}...")
         
         # Test 2: Get specific index info (if we can find an index)
-        indices_text = result.content[0].text
-        if "agent-alerts-000001" in indices_text:
+        if mentions(indices_text, "agent-alerts-000001"):
             specific_result = await session.call_tool("ListIndexTool", {"index": "agent-alerts-000001"})
-            print(f"   ✅ Specific index query: Success")
-            print(f"   📊 Specific result preview: {specific_result.content[0].text[:200]}...")
+            log(f"   ✅ Specific index query: Success")
+            log(f"   📊 Specific result preview: {specific_result.content[0].text[:200]}...")
         
     except Exception as e:
-        print(f"   ❌ ListIndexTool test failed: {e}")
+        log(f"   ❌ ListIndexTool test failed: {e}")
 
 
 async def test_index_mapping_tool(session):
     """Test IndexMappingTool functionality."""
     
-    print("   📋 Testing IndexMappingTool...")
+    log("   📋 Testing IndexMappingTool...")
     
     try:
         # Test with common system index
         result = await session.call_tool("IndexMappingTool", {"index": ".opensearch-observability"})
-        print(f"   ✅ Index mapping: Success")
-        print(f"   📊 Mapping preview: {result.content[0].text[:200]}...")
+        log(f"   ✅ Index mapping: Success")
+        log(f"   📊 Mapping preview: {result.content[0].text[:200]}...")
         
     except Exception as e:
-        print(f"   ❌ IndexMappingTool test failed: {e}")
+        log(f"   ❌ IndexMappingTool test failed: {e}")
 
 
 async def test_search_index_tool(session):
     """Test SearchIndexTool functionality."""
     
-    print("   📋 Testing SearchIndexTool...")
+    log("   📋 Testing SearchIndexTool...")
     
     try:
         # Test 1: Basic match_all query
@@ -144,8 +184,8 @@ async def test_search_index_tool(session):
             "index": "_all",
             "query": {"match_all": {}}
         })
-        print(f"   ✅ Basic search: Success")
-        print(f"   📊 Search preview: {result.content[0].text[:200]}...")
+        log(f"   ✅ Basic search: Success")
+        log(f"   📊 Search preview: {result.content[0].text[:200]}...")
         
         # Test 2: Search with size limit
         result = await session.call_tool("SearchIndexTool", {
@@ -153,75 +193,75 @@ async def test_search_index_tool(session):
             "query": {"match_all": {}},
             "size": 1
         })
-        print(f"   ✅ Limited search: Success")
+        log(f"   ✅ Limited search: Success")
         
     except Exception as e:
-        print(f"   ❌ SearchIndexTool test failed: {e}")
+        log(f"   ❌ SearchIndexTool test failed: {e}")
 
 
 async def test_get_shards_tool(session):
     """Test GetShardsTool functionality."""
     
-    print("   📋 Testing GetShardsTool...")
+    log("   📋 Testing GetShardsTool...")
     
     try:
         # Test with all shards
         result = await session.call_tool("GetShardsTool", {"index": "_all"})
-        print(f"   ✅ Get shards: Success")
-        print(f"   📊 Shards preview: {result.content[0].text[:200]}...")
+        log(f"   ✅ Get shards: Success")
+        log(f"   📊 Shards preview: {result.content[0].text[:200]}...")
         
     except Exception as e:
-        print(f"   ❌ GetShardsTool test failed: {e}")
+        log(f"   ❌ GetShardsTool test failed: {e}")
 
 
 async def test_cluster_health_tool(session):
     """Test ClusterHealthTool functionality."""
     
-    print("   📋 Testing ClusterHealthTool...")
+    log("   📋 Testing ClusterHealthTool...")
     
     try:
         result = await session.call_tool("ClusterHealthTool", {})
-        print(f"   ✅ Cluster health: Success")
-        print(f"   📊 Health preview: {result.content[0].text[:200]}...")
+        log(f"   ✅ Cluster health: Success")
+        log(f"   📊 Health preview: {result.content[0].text[:200]}...")
         
     except Exception as e:
-        print(f"   ❌ ClusterHealthTool test failed: {e}")
+        log(f"   ❌ ClusterHealthTool test failed: {e}")
 
 
 async def test_count_tool(session):
     """Test CountTool functionality."""
     
-    print("   📋 Testing CountTool...")
+    log("   📋 Testing CountTool...")
     
     try:
         result = await session.call_tool("CountTool", {
             "index": "_all",
             "body": {"query": {"match_all": {}}}
         })
-        print(f"   ✅ Count documents: Success")
-        print(f"   📊 Count preview: {result.content[0].text[:200]}...")
+        log(f"   ✅ Count documents: Success")
+        log(f"   📊 Count preview: {result.content[0].text[:200]}...")
         
     except Exception as e:
-        print(f"   ❌ CountTool test failed: {e}")
+        log(f"   ❌ CountTool test failed: {e}")
 
 
 async def test_explain_tool(session):
     """Test ExplainTool functionality."""
     
-    print("   📋 Testing ExplainTool...")
+    log("   📋 Testing ExplainTool...")
     
     try:
         # This tool requires a specific document ID, which we might not have
-        print("   ⚠️ ExplainTool requires specific document ID - skipping detailed test")
+        log("   ⚠️ ExplainTool requires specific document ID - skipping detailed test")
         
     except Exception as e:
-        print(f"   ❌ ExplainTool test failed: {e}")
+        log(f"   ❌ ExplainTool test failed: {e}")
 
 
 async def test_msearch_tool(session):
     """Test MsearchTool functionality."""
     
-    print("   📋 Testing MsearchTool...")
+    log("   📋 Testing MsearchTool...")
     
     try:
         # Multi-search query
@@ -236,11 +276,19 @@ async def test_msearch_tool(session):
             "index": "_all",
             "body": msearch_body
         })
-        print(f"   ✅ Multi-search: Success")
-        print(f"   📊 Multi-search preview: {result.content[0].text[:200]}...")
+        log(f"   ✅ Multi-search: Success")
+        log(f"   📊 Multi-search preview: {result.content[0].text[:200]}...")
         
     except Exception as e:
-        print(f"   ❌ MsearchTool test failed: {e}")
+        log(f"   ❌ MsearchTool test failed: {e}")
+
+
+async def main():
+    """Run the script, closing the shared MCP session afterwards."""
+    try:
+        await survey_all_tools()
+    finally:
+        await close_session()
 
 
 if __name__ == "__main__":
@@ -251,4 +299,4 @@ if __name__ == "__main__":
     print("   3. Virtual environment activated")
     print()
     
-    asyncio.run(survey_all_tools())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -8,11 +8,47 @@ import json
 import sys
 import os
 
+try:
+    import orjson
+    
+    loads = orjson.loads
+except ImportError:  # orjson comes with the optional 'speed' extra
+    loads = json.loads
+
 # Add src to path so we can import modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from mcp.client.streamable_http import streamablehttp_client
-from mcp.client.session import ClientSession
+from mcp_client_session import close_session, mcp_session, mentions
+
+
+# Alternative search patterns for the authentication events, built once at import
+_ALTERNATIVE_SEARCHES = (
+    {
+        "name": "Exact match (keyword)",
+        "query": {
+            "term": {
+                "event.category.keyword": "authentication"
+            }
+        }
+    },
+    {
+        "name": "Wildcard search",
+        "query": {
+            "wildcard": {
+                "event.category": "*auth*"
+            }
+        }
+    },
+    {
+        "name": "Match with size limit",
+        "query": {
+            "match": {
+                "event.category": "authentication"
+            }
+        },
+        "size": 5
+    }
+)
 
 
 async def test_authentication_events():
@@ -25,158 +61,146 @@ async def test_authentication_events():
     
     try:
         # Connect to MCP Server
-        async with streamablehttp_client("http://localhost:9900/mcp") as (read_stream, write_stream, _):
-            async with ClientSession(read_stream, write_stream) as session:
-                print("✅ Connected to MCP Server")
-                
-                # Initialize the session
-                await session.initialize()
-                print("✅ Session initialized")
-                
-                # List available tools
-                tools_response = await session.list_tools()
-                available_tools = [tool.name for tool in tools_response.tools]
-                print(f"✅ Available tools: {available_tools}")
-                
-                if "SearchIndexTool" not in available_tools:
-                    print("❌ SearchIndexTool not available")
-                    return
+        async with mcp_session() as session:
+            print("✅ Connected to MCP Server")
+            print("✅ Session initialized")
+            
+            # List available tools
+            tools_response = await session.list_tools()
+            available_tools = [tool.name for tool in tools_response.tools]
+            print(f"✅ Available tools: {available_tools}")
+            
+            if "SearchIndexTool" not in available_tools:
+                print("❌ SearchIndexTool not available")
+                return
+            
+            # Test 1: Check if agent-alerts-000001 index exists
+            print("\n🔍 Step 1: Check if agent-alerts-000001 index exists...")
+            if "ListIndexTool" in available_tools:
+                result = await session.call_tool("ListIndexTool", {})
+                indices_text = result.content[0].text
+                if mentions(indices_text, "agent-alerts-000001"):
+                    print("✅ agent-alerts-000001 index found")
+                else:
+                    print("⚠️ agent-alerts-000001 index not found")
+                    print("📋 Available indices:")
+                    print(indices_text[:500] + "...")
+            
+            # Test 2: Search for authentication events
+            print("\n🔍 Step 2: Search for authentication events...")
+            search_params = {
+                "index": "agent-alerts-000001",
+                "query": {
+                    "match": {
+                        "event.category": "authentication"
+                    }
+                }
+            }
+            
+            try:
+                result = await session.call_tool("SearchIndexTool", search_params)
+                print("✅ Authentication events search completed")
+                result_text = result.content[0].text
+                print("📊 Search result:")
+                print(result_text[:1000] + "...")
                 
-                # Test 1: Check if agent-alerts-000001 index exists
-                print("\n🔍 Step 1: Check if agent-alerts-000001 index exists...")
-                if "ListIndexTool" in available_tools:
-                    result = await session.call_tool("ListIndexTool", {})
-                    indices_text = result.content[0].text
-                    if "agent-alerts-000001" in indices_text:
-                        print("✅ agent-alerts-000001 index found")
-                    else:
-                        print("⚠️ agent-alerts-000001 index not found")
-                        print("📋 Available indices:")
-                        print(indices_text[:500] + "...")
+                # Parse the result to count hits
+                if "Search results from" in result_text:
+                    json_part = result_text.split("Search results from agent-alerts-000001:\n")[1]
+                    try:
+                        parsed_result = loads(json_part)
+                        total_hits = parsed_result.get("hits", {}).get("total", {})
+                        if isinstance(total_hits, dict):
+                            count = total_hits.get("value", 0)
+                        else:
+                            count = total_hits
+                        print(f"📊 Total authentication events found: {count}")
+                    except:
+                        print("📊 Could not parse hit count")
                 
-                # Test 2: Search for authentication events
-                print("\n🔍 Step 2: Search for authentication events...")
+            except Exception as e:
+                print(f"❌ Authentication events search failed: {e}")
+            
+            # Test 3: Try alternative search patterns
+            print("\n🔍 Step 3: Alternative search patterns...")
+            
+            # The searches are independent, so run them concurrently and
+            # print their results in order
+            results = await asyncio.gather(
+                *(run_alternative_search(session, search) for search in _ALTERNATIVE_SEARCHES)
+            )
+            for lines in results:
+                print("\n".join(lines))
+            
+            # Test 4: Search all event categories to see what's available
+            print("\n🔍 Step 4: Search all event categories...")
+            try:
                 search_params = {
                     "index": "agent-alerts-000001",
                     "query": {
-                        "match": {
-                            "event.category": "authentication"
-                        }
-                    }
-                }
-                
-                try:
-                    result = await session.call_tool("SearchIndexTool", search_params)
-                    print("✅ Authentication events search completed")
-                    print("📊 Search result:")
-                    print(result.content[0].text[:1000] + "...")
-                    
-                    # Parse the result to count hits
-                    result_text = result.content[0].text
-                    if "Search results from" in result_text:
-                        json_part = result_text.split("Search results from agent-alerts-000001:\n")[1]
-                        try:
-                            parsed_result = json.loads(json_part)
-                            total_hits = parsed_result.get("hits", {}).get("total", {})
-                            if isinstance(total_hits, dict):
-                                count = total_hits.get("value", 0)
-                            else:
-                                count = total_hits
-                            print(f"📊 Total authentication events found: {count}")
-                        except:
-                            print("📊 Could not parse hit count")
-                    
-                except Exception as e:
-                    print(f"❌ Authentication events search failed: {e}")
-                
-                # Test 3: Try alternative search patterns
-                print("\n🔍 Step 3: Alternative search patterns...")
-                
-                alternative_searches = [
-                    {
-                        "name": "Exact match (keyword)",
-                        "query": {
-                            "term": {
-                                "event.category.keyword": "authentication"
-                            }
-                        }
+                        "match_all": {}
                     },
-                    {
-                        "name": "Wildcard search",
-                        "query": {
-                            "wildcard": {
-                                "event.category": "*auth*"
-                            }
-                        }
-                    },
-                    {
-                        "name": "Match with size limit",
-                        "query": {
-                            "match": {
-                                "event.category": "authentication"
-                            }
-                        },
-                        "size": 5
-                    }
-                ]
+                    "size": 10
+                }
                 
-                for search in alternative_searches:
-                    try:
-                        print(f"\n   Testing: {search['name']}")
-                        search_params = {
-                            "index": "agent-alerts-000001",
-                            "query": search["query"]
-                        }
-                        if "size" in search:
-                            search_params["size"] = search["size"]
-                        
-                        result = await session.call_tool("SearchIndexTool", search_params)
-                        print(f"   ✅ {search['name']} completed")
-                        print(f"   📊 Result: {result.content[0].text[:300]}...")
-                        
-                    except Exception as e:
-                        print(f"   ❌ {search['name']} failed: {e}")
+                result = await session.call_tool("SearchIndexTool", search_params)
+                print("✅ Sample events search completed")
+                print("📊 Sample events to check available fields:")
+                print(result.content[0].text[:800] + "...")
                 
-                # Test 4: Search all event categories to see what's available
-                print("\n🔍 Step 4: Search all event categories...")
+            except Exception as e:
+                print(f"❌ Sample events search failed: {e}")
+            
+            # Test 5: Get index mapping to understand structure
+            print("\n🔍 Step 5: Get index mapping...")
+            if "IndexMappingTool" in available_tools:
                 try:
-                    search_params = {
-                        "index": "agent-alerts-000001",
-                        "query": {
-                            "match_all": {}
-                        },
-                        "size": 10
-                    }
-                    
-                    result = await session.call_tool("SearchIndexTool", search_params)
-                    print("✅ Sample events search completed")
-                    print("📊 Sample events to check available fields:")
-                    print(result.content[0].text[:800] + "...")
-                    
+                    result = await session.call_tool("IndexMappingTool", {
+                        "index": "agent-alerts-000001"
+                    })
+                    print("✅ Index mapping retrieved")
+                    print("📊 Index mapping:")
+                    print(result.content[0].text[:500] + "...")
                 except Exception as e:
-                    print(f"❌ Sample events search failed: {e}")
-                
-                # Test 5: Get index mapping to understand structure
-                print("\n🔍 Step 5: Get index mapping...")
-                if "IndexMappingTool" in available_tools:
-                    try:
-                        result = await session.call_tool("IndexMappingTool", {
-                            "index": "agent-alerts-000001"
-                        })
-                        print("✅ Index mapping retrieved")
-                        print("📊 Index mapping:")
-                        print(result.content[0].text[:500] + "...")
-                    except Exception as e:
-                        print(f"❌ Index mapping failed: {e}")
-                
-                print("\n🎉 Authentication events testing completed!")
-                
+                    print(f"❌ Index mapping failed: {e}")
+            
+            print("\n🎉 Authentication events testing completed!")
+            
     except Exception as e:
         print(f"❌ Error testing authentication events: {e}")
         import traceback
         traceback.print_exc()
 
 
+async def run_alternative_search(session, search):
+    """Run one alternative search pattern and return its report lines."""
+    
+    lines = [f"\n   Testing: {search['name']}"]
+    try:
+        search_params = {
+            "index": "agent-alerts-000001",
+            "query": search["query"]
+        }
+        if "size" in search:
+            search_params["size"] = search["size"]
+        
+        result = await session.call_tool("SearchIndexTool", search_params)
+        lines.append(f"   ✅ {search['name']} completed")
+        lines.append(f"   📊 Result: {result.content[0].text[:300]}...")
+        
+    except Exception as e:
+        lines.append(f"   ❌ {search['name']} failed: {e}")
+    return lines
+
+
+async def main():
+    """Run the script, closing the shared MCP session afterwards."""
+    try:
+        await test_authentication_events()
+    finally:
+        await close_session()
+
+
 if __name__ == "__main__":
     print("🚀 Starting Authentication Events Test")
     print("📝 Prerequisites:")
@@ -186,4 +210,4 @@ if __name__ == "__main__":
     print("   4. Virtual environment activated")
     print()
     
-    asyncio.run(test_authentication_events())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -3,154 +3,277 @@
 Live test for SearchIndexTool against real OpenSearch MCP Server
 """
 
+import argparse
 import asyncio
 import json
 import sys
 import os
+import time
 
 # Add src to path so we can import modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from mcp.client.streamable_http import streamablehttp_client
-from mcp.client.session import ClientSession
+import httpx
+from mcp import McpError
+from mcp_client_session import close_session, get_session
 
+# Set MCP_TEST_DEBUG to print the traceback of a failed run
+DEBUG = bool(os.environ.get("MCP_TEST_DEBUG"))
+# Seconds a single MCP request may take before it is reported as timed out
+CALL_TIMEOUT = float(os.environ.get("MCP_TIMEOUT", "10"))
 
-async def test_search_index_tool():
-    """Test SearchIndexTool against running MCP Server."""
+try:
+    import orjson
+except ImportError:  # orjson comes with the optional 'speed' extra
+    orjson = None
+
+# Clusters every test runs against: the server's default cluster and a named one
+CLUSTERS = ({}, {"opensearch_cluster_name": "remote-production"})
+
+MATCH_ALL = {"match_all": {}}
+
+# Tool calls made after the tool listing, built once at import:
+# (heading, result label, preview length, tool, arguments). Only a preview of
+# each result is printed, so the searches ask for few hits and no sources
+TESTS = (
+    ("Test 2: List all indices", "Indices result", 10000,
+     "ListIndexTool", {}),
+    ("Test 3: Basic search on all indices", "Search result", 500,
+     "SearchIndexTool", {
+         "index": "_all",
+         "query": {"query": MATCH_ALL, "size": 1, "_source": False, "track_total_hits": False},
+     }),
+    ("Test 4: Search with limited results", "Limited search result", 500,
+     "SearchIndexTool", {
+         "index": "_all",
+         "query": {"query": MATCH_ALL, "size": 5, "_source": False},
+     }),
+    ("Test 5: Search system indices", "System indices result", 300,
+     "SearchIndexTool", {
+         "index": ".opensearch*",
+         "query": {"query": MATCH_ALL, "size": 1, "_source": False, "track_total_hits": False},
+     }),
+    ("Test 6: Search with range query", "Range query result", 300,
+     "SearchIndexTool", {
+         "index": "_all",
+         "query": {
+             "query": {
+                 "bool": {
+                     "must": [MATCH_ALL],
+                     "filter": [{"range": {"@timestamp": {"gte": "now-1d"}}}],
+                 }
+             },
+             "size": 1,
+             "_source": False,
+             "track_total_hits": False,
+         },
+     }),
+)
+
+# Tool results reused for identical calls, keyed by tool name and canonical
+# JSON arguments, with the time they were fetched
+_TOOL_CACHE = {}
+_TOOL_CACHE_TTL = 60.0
+
+
+# Report lines of test_search_index_tool, written to stdout in one go at the end
+_log_buf = []
+
+
+def log(message=""):
+    """Buffer one report line."""
+    _log_buf.append(message)
+
+
+def flush_log():
+    """Write the buffered report lines to stdout with a single write."""
+    if _log_buf:
+        sys.stdout.write("\n".join(_log_buf) + "\n")
+        sys.stdout.flush()
+        _log_buf.clear()
+
+
+def _loads(text):
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is None:
+        return json.loads(text)
+    return orjson.loads(text)
+
+
+def _dumps_indented(obj):
+    """Serialize obj as indented JSON, using orjson when it is installed."""
+    if orjson is None:
+        return json.dumps(obj, indent=2)
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+def parse_result(result):
+    """Return (prefix, payload) for a tool result whose text is JSON, or (None, None).
+
+    Results such as "Search results from <index>:" put a header line before the
+    JSON; the header and its newline are returned as the prefix.
+    """
+    text = result.content[0].text
+    header, _, payload = text.partition("\n")
+    for prefix, body in (("", text), (header + "\n", payload)):
+        try:
+            return prefix, _loads(body)
+        except ValueError:
+            pass
+    return None, None
+
+
+def preview(result, n):
+    """Return the first n characters of a tool result with its JSON payload indented.
+
+    Text that isn't JSON is previewed as is.
+    """
+    prefix, payload = parse_result(result)
+    if prefix is None:
+        return result.content[0].text[:n]
+    return (prefix + _dumps_indented(payload))[:n]
+
+
+async def _cached(key, call):
+    """Return the result for key, starting call() unless a result within the TTL exists.
+
+    The pending task is cached, so concurrent identical calls share one request.
+    """
+    now = time.monotonic()
+    entry = _TOOL_CACHE.get(key)
+    if entry is None or now - entry[0] >= _TOOL_CACHE_TTL:
+        entry = (now, asyncio.ensure_future(call()))
+        _TOOL_CACHE[key] = entry
+    try:
+        return await entry[1]
+    except Exception:
+        # Don't keep failures around; the next identical call retries
+        if _TOOL_CACHE.get(key) is entry:
+            del _TOOL_CACHE[key]
+        raise
+
+
+async def cached_call(session, name, params):
+    """Call a tool, reusing the result of an identical call made within the TTL."""
+    key = (name, json.dumps(params, sort_keys=True, default=str))
+    # The timeout applies to the shared request, so a caller giving up
+    # doesn't cancel it for the others waiting on the same result
+    return await _cached(
+        key, lambda: asyncio.wait_for(session.call_tool(name, params), timeout=CALL_TIMEOUT)
+    )
+
+
+async def cached_list_tools(session):
+    """List the server's tools, reusing a listing fetched within the TTL."""
+    return await _cached(
+        ("list_tools", ""), lambda: asyncio.wait_for(session.list_tools(), timeout=CALL_TIMEOUT)
+    )
+
+
+async def test_search_index_tool(session=None, verbose=False):
+    """Test SearchIndexTool against running MCP Server.
+
+    Uses the given session, or the process-wide shared session so repeated runs
+    skip the connection setup and MCP initialize round trip. With verbose, each
+    tool's description is listed too. Returns the tests whose search returned more
+    hits than requested, if any.
+    """
     
-    print("🔍 Testing SearchIndexTool with live MCP Server...")
-    print("📋 Make sure MCP Server is running on http://localhost:9900")
+    log("🔍 Testing SearchIndexTool with live MCP Server...")
+    log("📋 Make sure MCP Server is running on http://localhost:9900")
     
     try:
         # Connect to MCP Server
-        async with streamablehttp_client("http://localhost:9900/mcp") as (read_stream, write_stream, _):
-            async with ClientSession(read_stream, write_stream) as session:
-                print("✅ Connected to MCP Server")
-                
-                # Initialize the session
-                await session.initialize()
-                print("✅ Session initialized")
-                
-                # Test 1: List available tools
-                print("\n📋 Test 1: List available tools...")
-                # streamibg_server.py 的server.list_tools功能
-                tools_response = await session.list_tools()
-                available_tools = [tool.name for tool in tools_response.tools]
-                print(f"✅ Available tools: {available_tools}")
-                
-                # Show detailed tool information
-                for tool in tools_response.tools:
-                    print(f"  • {tool.name}: {tool.description}")
-                
-                if "SearchIndexTool" not in available_tools:
-                    print("❌ SearchIndexTool not available")
-                    return
-                
-                # Test 2: List all indices with remote-production cluster
-                print("\n🔍 Test 2: List all indices for remote-production cluster...")
-                if "ListIndexTool" in available_tools:
-                    result = await session.call_tool("ListIndexTool", {
-                        "opensearch_cluster_name": "remote-production"
-                    })
-                    print(f"📊 Indices result:")
-                    print(result.content[0].text[:10000] + "...")
-                
-                # Test 3: Basic search on all indices
-                print("\n🔍 Test 3: Basic search on all indices...")
-                search_params = {
-                    "opensearch_cluster_name": "remote-production",
-                    "index": "_all",
-                    "query": {
-                        "query": {
-                            "match_all": {}
-                        },
-                        "size": 5
-                    }
-                }
-                
-                if "SearchIndexTool" in available_tools:
-                    result = await session.call_tool("SearchIndexTool", search_params)
-                    print(f"📊 Search result:")
-                    print(result.content[0].text[:500] + "...")
-                
-                # Test 4: Search with size limit
-                print("\n🔍 Test 4: Search with limited results...")
-                search_params = {
-                    "opensearch_cluster_name": "remote-production",
-                    "index": "_all",
-                    "query": {
-                        "query": {
-                            "match_all": {}
-                        },
-                        "size": 5
-                    }
-                }
-                
-                if "SearchIndexTool" in available_tools:
-                    result = await session.call_tool("SearchIndexTool", search_params)
-                    print(f"📊 Limited search result:")
-                    print(result.content[0].text[:500] + "...")
-                
-                # Test 5: Search system indices
-                print("\n🔍 Test 5: Search system indices...")
-                search_params = {
-                    "opensearch_cluster_name": "remote-production",
-                    "index": ".opensearch*",
-                    "query": {
-                        "query": {
-                            "match_all": {}
-                        }
-                    }
-                }
-                
-                if "SearchIndexTool" in available_tools:
-                    try:
-                        result = await session.call_tool("SearchIndexTool", search_params)
-                        print(f"📊 System indices result:")
-                        print(result.content[0].text[:300] + "...")
-                    except Exception as e:
-                        print(f"⚠️ System indices search failed: {e}")
-                
-                # Test 6: Search with range query
-                print("\n🔍 Test 6: Search with range query...")
-                search_params = {
-                    "opensearch_cluster_name": "remote-production",
-                    "index": "_all",
-                    "query": {
-                        "bool": {
-                            "must": [
-                                {"match_all": {}}
-                            ],
-                            "filter": [
-                                {
-                                    "range": {
-                                        "@timestamp": {
-                                            "gte": "now-1d"
-                                        }
-                                    }
-                                }
-                            ]
-                        }
-                    }
-                }
-                
-                if "SearchIndexTool" in available_tools:
-                    try:
-                        result = await session.call_tool("SearchIndexTool", search_params)
-                        print(f"📊 Range query result:")
-                        print(result.content[0].text[:300] + "...")
-                    except Exception as e:
-                        print(f"⚠️ Range query failed: {e}")
-                
-                print("\n🎉 SearchIndexTool testing completed successfully!")
-                
-    except Exception as e:
-        print(f"❌ Error testing SearchIndexTool: {e}")
-        import traceback
-        traceback.print_exc()
+        if session is None:
+            session = await get_session()
+        log("✅ Connected to MCP Server")
+        log("✅ Session initialized")
+        
+        # Test 1: List available tools
+        log("\n📋 Test 1: List available tools...")
+        # streamibg_server.py 的server.list_tools功能
+        tools_response = await cached_list_tools(session)
+        available_tools = [tool.name for tool in tools_response.tools]
+        log(f"✅ Available tools: {available_tools}")
+        
+        # Show detailed tool information
+        if verbose:
+            for tool in tools_response.tools:
+                log(f"  • {tool.name}: {tool.description}")
+        
+        if "SearchIndexTool" not in available_tools:
+            log("❌ SearchIndexTool not available")
+            return
+        
+        tests = [
+            (cluster_args, *test)
+            for cluster_args in CLUSTERS
+            for test in TESTS
+            if test[3] in available_tools
+        ]
+        
+        # The calls are independent, so issue them together on the one
+        # session and print the results afterwards in a fixed order
+        results = await asyncio.gather(
+            *(
+                cached_call(session, tool, {**cluster_args, **params})
+                for cluster_args, _, _, _, tool, params in tests
+            ),
+            return_exceptions=True,
+        )
+        size_failures = []
+        for test, result in zip(tests, results):
+            cluster_args, heading, label, preview_chars, _, params = test
+            cluster = cluster_args.get("opensearch_cluster_name", "default cluster")
+            log(f"\n🔍 {heading} ({cluster})...")
+            if isinstance(result, asyncio.TimeoutError):
+                log(f"⚠️ {label} timed out after {CALL_TIMEOUT:g}s")
+                continue
+            if isinstance(result, Exception):
+                log(f"⚠️ {label} failed: {result}")
+                continue
+            log(f"📊 {label}:")
+            log(preview(result, preview_chars) + "...")
+            # A size placed where OpenSearch ignores it silently returns ten hits
+            size = params.get("query", {}).get("size")
+            _, payload = parse_result(result)
+            if size is not None and isinstance(payload, dict) and "hits" in payload:
+                hit_count = len(payload["hits"]["hits"])
+                if hit_count > size:
+                    log(f"⚠️ {label} failed: {hit_count} hits, expected at most {size}")
+                    size_failures.append(f"{heading} ({cluster})")
+        
+        if size_failures:
+            log(f"\n❌ Result size check failed for: {', '.join(size_failures)}")
+            return size_failures
+        log("\n🎉 SearchIndexTool testing completed successfully!")
+        
+    except (McpError, httpx.HTTPError, OSError, asyncio.TimeoutError) as e:
+        # Server and connection failures; anything else is a bug and propagates
+        log(f"❌ Error testing SearchIndexTool: {type(e).__name__}: {e}")
+        if DEBUG:
+            import traceback
+
+            log(traceback.format_exc().rstrip())
+    finally:
+        flush_log()
+
+
+async def main(verbose=False):
+    """Run the live test, closing the shared MCP session afterwards."""
+    try:
+        return await test_search_index_tool(verbose=verbose)
+    finally:
+        await close_session()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live test for SearchIndexTool")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show the description of each available tool"
+    )
+    args = parser.parse_args()
+    
     print("🚀 Starting SearchIndexTool Live Test")
     print("📝 Prerequisites:")
     print("   1. MCP Server running on http://localhost:9900")
@@ -158,4 +281,13 @@ if __name__ == "__main__":
     print("   3. Virtual environment activated")
     print()
     
-    asyncio.run(test_search_index_tool())
\ No newline at end of file
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    if asyncio.run(main(verbose=args.verbose)):
+        sys.exit(1)
\ No newline at end of file
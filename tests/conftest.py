@@ -0,0 +1,14 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fresh_client_env():
+    """Make the OpenSearch client re-read environment variables patched by each test."""
+    from opensearch.client import refresh_env
+
+    refresh_env()
+    yield
+    refresh_env()
@@ -0,0 +1,92 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import pytest
+import sys
+from mcp_server_opensearch.env_config import load_env_file
+
+
+class TestLoadEnvFile:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self, monkeypatch):
+        """Reset the loader cache and test variable around each test."""
+        monkeypatch.delenv('ENV_CONFIG_TEST_VAR', raising=False)
+        load_env_file.cache_clear()
+        yield
+        load_env_file.cache_clear()
+
+    def test_loads_variables(self, tmp_path):
+        """Test that variables from the .env file are exported."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('# comment\nENV_CONFIG_TEST_VAR=loaded\n')
+
+        load_env_file(str(env_file))
+
+        assert os.environ['ENV_CONFIG_TEST_VAR'] == 'loaded'
+
+    def test_reads_file_once(self, tmp_path):
+        """Test that repeated calls with the same path do not re-read the file."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('ENV_CONFIG_TEST_VAR=first\n')
+        load_env_file(str(env_file))
+
+        env_file.write_text('ENV_CONFIG_TEST_VAR=second\n')
+        del os.environ['ENV_CONFIG_TEST_VAR']
+        load_env_file(str(env_file))
+
+        assert 'ENV_CONFIG_TEST_VAR' not in os.environ
+
+    def test_fallback_parser(self, tmp_path, monkeypatch):
+        """Test the parser used without python-dotenv keeps existing variables."""
+        monkeypatch.setitem(sys.modules, 'dotenv', None)
+        monkeypatch.delenv('ENV_CONFIG_OTHER_VAR', raising=False)
+        monkeypatch.setenv('ENV_CONFIG_PRESET_VAR', 'preset')
+        env_file = tmp_path / '.env'
+        env_file.write_text(
+            '# ENV_CONFIG_OTHER_VAR=commented\n'
+            '  ENV_CONFIG_TEST_VAR = loaded  \n'
+            'ENV_CONFIG_PRESET_VAR=from-file\n'
+            'not a variable\n'
+        )
+
+        load_env_file(str(env_file))
+
+        assert os.environ['ENV_CONFIG_TEST_VAR'] == 'loaded'
+        assert os.environ['ENV_CONFIG_PRESET_VAR'] == 'preset'
+        assert 'ENV_CONFIG_OTHER_VAR' not in os.environ
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing .env file is ignored."""
+        load_env_file(str(tmp_path / 'missing.env'))
+
+        assert 'ENV_CONFIG_TEST_VAR' not in os.environ
+
+
+class TestResolveEnvPath:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Reset the resolver cache around each test."""
+        from mcp_server_opensearch import _resolve_env_path
+
+        _resolve_env_path.cache_clear()
+        yield
+        _resolve_env_path.cache_clear()
+
+    def test_env_file_variable(self, tmp_path, monkeypatch):
+        """Test that MCP_ENV_FILE takes precedence over the default locations."""
+        from mcp_server_opensearch import _resolve_env_path
+
+        env_file = tmp_path / 'custom.env'
+        env_file.write_text('ENV_CONFIG_TEST_VAR=custom\n')
+        monkeypatch.setenv('MCP_ENV_FILE', str(env_file))
+
+        assert _resolve_env_path() == env_file
+
+    def test_env_file_variable_missing(self, tmp_path, monkeypatch):
+        """Test that a missing MCP_ENV_FILE resolves to no file."""
+        from mcp_server_opensearch import _resolve_env_path
+
+        monkeypatch.setenv('MCP_ENV_FILE', str(tmp_path / 'missing.env'))
+
+        assert _resolve_env_path() is None
@@ -0,0 +1,323 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams, ListToolsRequest
+from unittest.mock import AsyncMock, patch
+
+
+@pytest.fixture
+def mock_client():
+    """Mock AsyncOpenSearch client returned by get_local_opensearch_client."""
+    client = AsyncMock()
+    client.search.return_value = {'hits': {'hits': []}}
+    with patch(
+        'mcp_server_opensearch.simple_local_server.get_local_opensearch_client',
+        return_value=client,
+    ):
+        yield client
+
+
+@pytest.fixture
+def server():
+    """Create the log search MCP server."""
+    from mcp_server_opensearch.simple_local_server import build_simple_local_server
+
+    return build_simple_local_server()
+
+
+async def call(server, name, arguments):
+    """Invoke a tool through the server's call_tool handler and return the text."""
+    request = CallToolRequest(
+        method='tools/call', params=CallToolRequestParams(name=name, arguments=arguments)
+    )
+    result = await server.request_handlers[CallToolRequest](request)
+    return result.root.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_list_tools(server):
+    """Test that all log search tools are listed with their schemas."""
+    result = await server.request_handlers[ListToolsRequest](ListToolsRequest(method='tools/list'))
+
+    tools = {tool.name: tool for tool in result.root.tools}
+    assert set(tools) == {
+        'search_logs_by_keyword',
+        'search_logs_advanced',
+        'list_log_indices',
+        'cluster_health',
+    }
+    assert tools['search_logs_by_keyword'].inputSchema['required'] == ['keyword']
+
+
+@pytest.mark.asyncio
+async def test_search_logs_by_keyword(server, mock_client):
+    """Test that keyword search builds a multi_match query with defaults filled in."""
+    text = await call(server, 'search_logs_by_keyword', {'keyword': 'error'})
+
+    assert text == "No logs found containing 'error'"
+    body = mock_client.search.call_args.kwargs['body']
+    assert mock_client.search.call_args.kwargs['index'] == '*'
+    assert body['size'] == 10
+    assert body['query']['multi_match']['query'] == 'error'
+    # The whole source is fetched, so the other short fields can be shown
+    assert '_source' not in body
+
+
+@pytest.mark.asyncio
+async def test_search_logs_by_keyword_time_range(server, mock_client):
+    """Test that a time range wraps the keyword query in a bool filter."""
+    await call(server, 'search_logs_by_keyword', {'keyword': 'error', 'time_range': '1h'})
+
+    query = mock_client.search.call_args.kwargs['body']['query']
+    assert query['bool']['must'][0]['multi_match']['query'] == 'error'
+    assert query['bool']['filter'][0]['range']['@timestamp']['gte'] == 'now-1h'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('arguments', [{}, {'keyword': ''}, {'keyword': 'error', 'size': 101}])
+async def test_search_logs_by_keyword_invalid_arguments(server, mock_client, arguments):
+    """Test that invalid arguments are reported without querying OpenSearch."""
+    text = await call(server, 'search_logs_by_keyword', arguments)
+
+    assert text.startswith('Error executing search_logs_by_keyword:')
+    mock_client.search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_error(server, mock_client):
+    """Test that OpenSearch errors are reported to the client."""
+    from opensearchpy.exceptions import ConnectionError
+
+    mock_client.search.side_effect = ConnectionError('N/A', 'connection refused', None)
+
+    text = await call(server, 'search_logs_advanced', {'query': {'query': {'match_all': {}}}})
+
+    assert text.startswith('Error executing search_logs_advanced:')
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool(server, mock_client):
+    """Test that unknown tools are rejected."""
+    text = await call(server, 'missing_tool', {})
+
+    assert text == 'Unknown tool: missing_tool'
+
+
+@pytest.mark.asyncio
+async def test_list_indices_pattern_ignores_case(server, mock_client, response_cache):
+    """Test that the index pattern is lowercased to match OpenSearch index names."""
+    mock_client.cat.indices.return_value = [
+        {'index': 'app-logs', 'docs.count': '3', 'store.size': '1kb'}
+    ]
+
+    text = await call(server, 'list_log_indices', {'pattern': 'Log'})
+
+    assert mock_client.cat.indices.call_args.kwargs['index'] == '*log*'
+    assert '• app-logs (docs: 3, size: 1kb)' in text
+
+
+@pytest.mark.asyncio
+async def test_concurrent_keyword_searches_use_msearch(server, mock_client):
+    """Test that concurrent keyword searches are coalesced into one _msearch request."""
+    import asyncio
+
+    hit = {'_index': 'logs', '_source': {'message': 'login error'}}
+    mock_client.msearch.return_value = {
+        'responses': [{'hits': {'hits': [hit]}}, {'hits': {'hits': []}}]
+    }
+
+    first, second = await asyncio.gather(
+        call(server, 'search_logs_by_keyword', {'keyword': 'error'}),
+        call(server, 'search_logs_by_keyword', {'keyword': 'timeout', 'index_pattern': 'logs'}),
+    )
+
+    mock_client.search.assert_not_called()
+    mock_client.msearch.assert_called_once()
+    lines = mock_client.msearch.call_args.kwargs['body'].splitlines()
+    assert len(lines) == 4
+    assert json.loads(lines[2]) == {'index': 'logs'}
+    assert first.startswith("Found 1 logs containing 'error'")
+    assert second == "No logs found containing 'timeout'"
+
+
+@pytest.mark.asyncio
+async def test_msearch_item_error(server, mock_client):
+    """Test that a failed _msearch item is reported only for its own search."""
+    import asyncio
+
+    mock_client.msearch.return_value = {
+        'responses': [
+            {'error': {'type': 'index_not_found_exception'}, 'status': 404},
+            {'hits': {'hits': []}},
+        ]
+    }
+
+    first, second = await asyncio.gather(
+        call(server, 'search_logs_by_keyword', {'keyword': 'error', 'index_pattern': 'missing'}),
+        call(server, 'search_logs_by_keyword', {'keyword': 'timeout'}),
+    )
+
+    assert first.startswith('Error executing search_logs_by_keyword:')
+    assert second == "No logs found containing 'timeout'"
+
+
+def test_format_log_search_results():
+    """Test that the highest-priority non-empty field of each group is shown first."""
+    from mcp_server_opensearch.simple_local_server import format_log_search_results
+
+    hit = {
+        '_index': 'logs',
+        '_score': 1.5,
+        '_source': {
+            'service': 'auth',
+            'log': 'fallback message',
+            'msg': '',
+            'message': 'login failed',
+            'time': 'later',
+            '@timestamp': '2024-01-01T00:00:00Z',
+            'host': {'name': 'web-1'},
+            'trace': 'x' * 100,
+        },
+    }
+
+    text = format_log_search_results([hit], 'login')
+
+    assert text == (
+        "Found 1 logs containing 'login':\n\n"
+        '=== Log 1 (Score: 1.50) ===\n'
+        'Index: logs\n'
+        'Timestamp: 2024-01-01T00:00:00Z\n'
+        'Message: login failed\n'
+        'Host: web-1\n'
+        'service: auth\n'
+        '\n'
+    )
+
+
+def test_multi_worker_app_is_stateless():
+    """Test that the worker app serves stateless streamable HTTP and refuses SSE."""
+    from mcp_server_opensearch.simple_local_server import app_factory
+    from starlette.testclient import TestClient
+
+    app = app_factory()
+
+    with TestClient(app) as client:
+        assert client.get('/sse').status_code == 501
+        assert client.post('/messages/?session_id=abc').status_code == 501
+        assert client.get('/health').status_code == 200
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    """Empty response cache driven by a fake clock; advance by setting clock[0]."""
+    import mcp_server_opensearch.simple_local_server as sls
+    from types import SimpleNamespace
+
+    clock = [0.0]
+    monkeypatch.setattr(sls, 'time', SimpleNamespace(monotonic=lambda: clock[0]))
+    monkeypatch.setattr(sls, '_RESP_CACHE', {})
+    monkeypatch.setattr(sls, '_RESP_INFLIGHT', {})
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_cached_response_expires(response_cache):
+    """Test that a cached response is reused within the TTL and refetched after it."""
+    from mcp_server_opensearch.simple_local_server import _RESP_CACHE_TTL, _cached_response
+
+    fetch = AsyncMock(side_effect=[['first'], ['second']])
+
+    assert await _cached_response(('tool', ''), fetch) == ['first']
+    assert await _cached_response(('tool', ''), fetch) == ['first']
+    response_cache[0] = _RESP_CACHE_TTL + 1
+    assert await _cached_response(('tool', ''), fetch) == ['second']
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_response_single_flight(response_cache):
+    """Test that concurrent callers share one fetch, even if the first is cancelled."""
+    import asyncio
+    from mcp_server_opensearch.simple_local_server import _cached_response
+
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await release.wait()
+        return ['health']
+
+    first = asyncio.create_task(_cached_response(('cluster_health', ''), fetch))
+    second = asyncio.create_task(_cached_response(('cluster_health', ''), fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == ['health']
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_response_failure_not_cached(response_cache):
+    """Test that a failed fetch is raised to its callers and retried next time."""
+    from mcp_server_opensearch.simple_local_server import _cached_response
+
+    fetch = AsyncMock(side_effect=[RuntimeError('down'), ['ok']])
+
+    with pytest.raises(RuntimeError):
+        await _cached_response(('tool', ''), fetch)
+    assert await _cached_response(('tool', ''), fetch) == ['ok']
+
+
+@pytest.mark.asyncio
+async def test_cached_response_evicts_oldest(response_cache, monkeypatch):
+    """Test that a full cache drops expired entries, then the oldest one."""
+    import mcp_server_opensearch.simple_local_server as sls
+
+    monkeypatch.setattr(sls, '_RESP_CACHE_MAXSIZE', 2)
+    for name in ('a', 'b', 'c'):
+        await sls._cached_response((name,), AsyncMock(return_value=[name]))
+
+    assert list(sls._RESP_CACHE) == [('b',), ('c',)]
+
+    response_cache[0] = sls._RESP_CACHE_TTL + 1
+    await sls._cached_response(('d',), AsyncMock(return_value=['d']))
+    assert list(sls._RESP_CACHE) == [('d',)]
+
+
+@pytest.mark.asyncio
+async def test_msearch_batches_only_behind_inflight_search():
+    """Test that a lone search is sent at once and later ones batch behind it."""
+    import asyncio
+    from mcp_server_opensearch.simple_local_server import MSearchBatcher
+
+    release = asyncio.Event()
+    client = AsyncMock()
+
+    async def search(index, body):
+        await release.wait()
+        return {'hits': {'hits': []}}
+
+    client.search.side_effect = search
+    client.msearch.return_value = {'responses': [{'hits': {}}, {'hits': {}}]}
+    batcher = MSearchBatcher(client, window_ms=10_000)
+
+    first = asyncio.create_task(batcher.submit('logs', {'size': 1}))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    client.search.assert_called_once()
+
+    queued = [asyncio.create_task(batcher.submit('logs', {'size': n})) for n in (2, 3)]
+    for _ in range(5):
+        await asyncio.sleep(0)
+    client.msearch.assert_not_called()
+
+    release.set()
+    await asyncio.wait_for(asyncio.gather(first, *queued), timeout=1)
+    client.msearch.assert_called_once()
+    assert client.search.call_count == 1
@@ -4,7 +4,20 @@
 import boto3
 import os
 import pytest
-from opensearch.client import initialize_client
+import ssl
+from botocore.credentials import DeferredRefreshableCredentials, JSONFileCache
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from opensearch.client import (
+    _AUTH_STRATEGY_CACHE,
+    _CLIENT_CACHE,
+    _CLUSTER_CLIENTS,
+    _KNOWN_BAD,
+    _get_boto_session,
+    configure_client_module,
+    initialize_client,
+    is_serverless,
+    refresh_env,
+)
 from opensearchpy import RequestsHttpConnection
 from requests_aws4auth import AWS4Auth
 from tools.tool_params import baseToolArgs
@@ -20,6 +33,11 @@ class TestOpenSearchClient:
             if key in os.environ:
                 self.original_env[key] = os.environ[key]
                 del os.environ[key]
+        _CLIENT_CACHE.clear()
+        _AUTH_STRATEGY_CACHE.clear()
+        _CLUSTER_CLIENTS.clear()
+        _KNOWN_BAD.clear()
+        _get_boto_session.cache_clear()
 
     def teardown_method(self):
         """Cleanup after each test method."""
@@ -59,9 +77,103 @@ class TestOpenSearchClient:
             use_ssl=True,
             verify_certs=True,
             connection_class=RequestsHttpConnection,
+            pool_maxsize=32,
+            max_retries=3,
+            retry_on_timeout=True,
             http_auth=('test-user', 'test-password'),
         )
 
+    @patch('opensearch.client.OpenSearch')
+    def test_initialize_client_reuses_client(self, mock_opensearch):
+        """Test that repeated calls for the same settings reuse one client."""
+        os.environ['OPENSEARCH_USERNAME'] = 'test-user'
+        os.environ['OPENSEARCH_PASSWORD'] = 'test-password'
+        os.environ['OPENSEARCH_URL'] = 'https://test-opensearch-domain.com'
+
+        first = initialize_client(baseToolArgs())
+        second = initialize_client(baseToolArgs())
+
+        assert first is second
+        mock_opensearch.assert_called_once()
+
+        # Different settings get their own client
+        os.environ['OPENSEARCH_URL'] = 'https://other-opensearch-domain.com'
+        refresh_env()
+        initialize_client(baseToolArgs())
+        assert mock_opensearch.call_count == 2
+
+    @patch('opensearch.client.OpenSearch')
+    @patch(
+        'opensearch.client._resolve_auth_strategy', return_value=(lambda: ('user', 'pass'), True)
+    )
+    def test_auth_strategy_resolved_once(self, mock_resolve, mock_opensearch):
+        """Test that the authentication method is chosen once per auth settings."""
+        os.environ['OPENSEARCH_URL'] = 'https://test-opensearch-domain.com'
+        initialize_client(baseToolArgs())
+
+        # A new client for another URL reuses the resolved strategy
+        os.environ['OPENSEARCH_URL'] = 'https://other-opensearch-domain.com'
+        refresh_env()
+        initialize_client(baseToolArgs())
+
+        mock_resolve.assert_called_once()
+        assert mock_opensearch.call_count == 2
+        assert mock_opensearch.call_args.kwargs['http_auth'] == ('user', 'pass')
+
+    @patch('opensearch.client.initialize_client_with_cluster')
+    def test_initialize_client_registry_cluster(self, mock_initialize):
+        """Test that registry clusters reuse their client until the entry is replaced."""
+        cluster = ClusterInfo(opensearch_url='https://cluster-a.com')
+        with patch.dict(cluster_registry, {'cluster-a': cluster}):
+            args = baseToolArgs(opensearch_cluster_name='cluster-a')
+            first = initialize_client(args)
+            second = initialize_client(args)
+
+            assert first is second
+            mock_initialize.assert_called_once_with(cluster)
+
+            replacement = ClusterInfo(opensearch_url='https://cluster-a.com')
+            cluster_registry['cluster-a'] = replacement
+            initialize_client(args)
+            mock_initialize.assert_called_with(replacement)
+            assert mock_initialize.call_count == 2
+
+    @patch('opensearch.client.initialize_client_with_cluster')
+    def test_initialize_client_cluster_without_url(self, mock_initialize):
+        """Test that a registry cluster without a URL fails fast until it is replaced."""
+        cluster = ClusterInfo(opensearch_url='')
+        with patch.dict(cluster_registry, {'cluster-a': cluster}):
+            args = baseToolArgs(opensearch_cluster_name='cluster-a')
+            for _ in range(2):
+                with pytest.raises(ValueError, match='OpenSearch URL must be provided'):
+                    initialize_client(args)
+            mock_initialize.assert_not_called()
+
+            replacement = ClusterInfo(opensearch_url='https://cluster-a.com')
+            cluster_registry['cluster-a'] = replacement
+            initialize_client(args)
+            mock_initialize.assert_called_once_with(replacement)
+            assert 'cluster-a' not in _KNOWN_BAD
+
+    @patch('opensearch.client.initialize_client_with_cluster')
+    def test_initialize_client_default_cluster(self, mock_initialize, caplog):
+        """Test that the first registry cluster is chosen once and logged once."""
+        first = ClusterInfo(opensearch_url='https://cluster-a.com')
+        second = ClusterInfo(opensearch_url='https://cluster-b.com')
+        with (
+            patch.dict(cluster_registry, {'cluster-a': first, 'cluster-b': second}, clear=True),
+            caplog.at_level('INFO', logger='opensearch.client'),
+        ):
+            initialize_client(baseToolArgs())
+            initialize_client(baseToolArgs())
+            mock_initialize.assert_called_once_with(first)
+            assert caplog.text.count('using first available cluster') == 1
+
+            # Removing the default cluster moves the choice to the next one
+            del cluster_registry['cluster-a']
+            initialize_client(baseToolArgs())
+            mock_initialize.assert_called_with(second)
+
     @patch('opensearch.client.OpenSearch')
     @patch('opensearch.client.boto3.Session')
     def test_initialize_client_aws_auth(self, mock_session, mock_opensearch):
@@ -97,6 +209,81 @@ class TestOpenSearchClient:
         assert call_kwargs['connection_class'] == RequestsHttpConnection
         assert isinstance(call_kwargs['http_auth'], AWS4Auth)
 
+    @patch('opensearch.client.OpenSearch')
+    @patch('opensearch.client.AssumeRoleCredentialFetcher')
+    @patch('opensearch.client.boto3.Session')
+    def test_initialize_client_iam_auth(self, mock_session, mock_fetcher, mock_opensearch):
+        """Test that IAM role credentials come from the cached assume-role fetcher."""
+        os.environ['AWS_REGION'] = 'us-west-2'
+        os.environ['OPENSEARCH_URL'] = 'https://test-opensearch-domain.com'
+        mock_session.return_value.region_name = None
+        mock_fetcher.return_value.fetch_credentials.return_value = {
+            'access_key': 'role-access-key',
+            'secret_key': 'role-secret-key',
+            'token': 'role-token',
+            'expiry_time': '2999-01-01T00:00:00+00:00',
+        }
+
+        with patch.dict(os.environ, {'AWS_IAM_ARN': 'arn:aws:iam::123456789012:role/test'}):
+            initialize_client(baseToolArgs())
+
+        fetcher_kwargs = mock_fetcher.call_args.kwargs
+        assert fetcher_kwargs['role_arn'] == 'arn:aws:iam::123456789012:role/test'
+        assert isinstance(fetcher_kwargs['cache'], JSONFileCache)
+        http_auth = mock_opensearch.call_args.kwargs['http_auth']
+        assert isinstance(http_auth.refreshable_credentials, DeferredRefreshableCredentials)
+        assert http_auth.refreshable_credentials.access_key == 'role-access-key'
+        assert http_auth.region == 'us-west-2'
+
+    @patch('opensearch.client.OpenSearch')
+    @patch('opensearch.client._iam_auth_factory')
+    @patch('opensearch.client.boto3.Session')
+    def test_iam_auth_retried_after_failure(self, mock_session, mock_iam, mock_opensearch):
+        """Test that a failed IAM role lookup is not cached with its fallback."""
+        os.environ['AWS_REGION'] = 'us-west-2'
+        os.environ['OPENSEARCH_URL'] = 'https://test-opensearch-domain.com'
+        mock_session.return_value.get_credentials.return_value = None
+        role_auth = Mock()
+        mock_iam.side_effect = [RuntimeError('STS timeout'), lambda: role_auth]
+        mock_opensearch.side_effect = lambda **kwargs: Mock()
+
+        with patch.dict(os.environ, {'AWS_IAM_ARN': 'arn:aws:iam::123456789012:role/test'}):
+            refresh_env()
+            first = initialize_client(baseToolArgs())
+            assert 'http_auth' not in mock_opensearch.call_args.kwargs
+
+            second = initialize_client(baseToolArgs())
+            assert mock_opensearch.call_args.kwargs['http_auth'] is role_auth
+            assert second is not first
+            assert initialize_client(baseToolArgs()) is second
+
+        assert mock_iam.call_count == 2
+        assert mock_opensearch.call_count == 2
+
+    @patch('opensearch.client.OpenSearch')
+    @patch('opensearch.client.boto3.Session')
+    def test_no_auth_without_region_is_cached(self, mock_session, mock_opensearch):
+        """Test that a plain URL with no AWS region or credentials reuses its client."""
+        os.environ['OPENSEARCH_URL'] = 'http://localhost:9200'
+        mock_session.return_value.region_name = None
+        mock_session.return_value.get_credentials.return_value = None
+        mock_opensearch.side_effect = lambda **kwargs: Mock()
+
+        first = initialize_client(baseToolArgs())
+
+        assert initialize_client(baseToolArgs()) is first
+        assert mock_opensearch.call_count == 1
+        assert len(_AUTH_STRATEGY_CACHE) == 1
+
+    @patch('opensearch.client.boto3.Session')
+    def test_boto_session_reused_per_profile(self, mock_session):
+        """Test that one boto3 session is created per profile."""
+        assert _get_boto_session('dev') is _get_boto_session('dev')
+        _get_boto_session('')
+
+        assert mock_session.call_count == 2
+        mock_session.assert_any_call(profile_name='dev')
+
     @patch('opensearch.client.OpenSearch')
     @patch('opensearch.client.boto3.Session')
     def test_initialize_client_aws_auth_error(self, mock_session, mock_opensearch):
@@ -137,3 +324,38 @@ class TestOpenSearchClient:
         assert (
             str(exc_info.value) == 'No valid AWS or basic authentication provided for OpenSearch'
         )
+
+
+@pytest.mark.parametrize(
+    'target, expected',
+    [
+        (None, True),
+        (baseToolArgs(), True),
+        (baseToolArgs(opensearch_cluster_name='missing'), True),
+        (baseToolArgs(opensearch_cluster_name='serverless'), False),
+        (ClusterInfo(opensearch_url='https://a.com', is_serverless=True), True),
+        (ClusterInfo(opensearch_url='https://a.com'), False),
+    ],
+)
+def test_is_serverless(target, expected):
+    """Test that cluster settings take precedence over AWS_OPENSEARCH_SERVERLESS."""
+    cluster = ClusterInfo(opensearch_url='https://a.com', is_serverless=False)
+    with (
+        patch.dict(os.environ, {'AWS_OPENSEARCH_SERVERLESS': 'true'}),
+        patch.dict(cluster_registry, {'serverless': cluster}),
+    ):
+        refresh_env()
+        assert is_serverless(target) is expected
+
+
+def test_configure_client_module(monkeypatch):
+    """Test that SSL verification is only disabled process-wide when asked for."""
+    monkeypatch.setattr(ssl, '_create_default_https_context', ssl.create_default_context)
+    with patch('opensearch.client.urllib3.disable_warnings') as mock_disable:
+        configure_client_module()
+        assert ssl._create_default_https_context is ssl.create_default_context
+        mock_disable.assert_not_called()
+
+        configure_client_module(insecure_ssl=True)
+        assert ssl._create_default_https_context is ssl._create_unverified_context
+        mock_disable.assert_called_once()
@@ -0,0 +1,35 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from pathlib import Path
+
+
+try:
+    import tomllib
+except ModuleNotFoundError:
+    tomllib = pytest.importorskip('tomli')
+
+PYPROJECT = Path(__file__).resolve().parents[1] / 'pyproject.toml'
+
+
+@pytest.fixture(scope='module')
+def project():
+    """Parsed [project] table of the repository's pyproject.toml."""
+    with open(PYPROJECT, 'rb') as f:
+        return tomllib.load(f)['project']
+
+
+def test_license_metadata_in_project(project):
+    """Test that the license keys belong to [project] rather than a sub-table."""
+    assert project['license'] == 'Apache-2.0'
+    assert project['license-files'] == ['LICENSE', 'NOTICE']
+
+
+def test_optional_dependencies_are_lists(project):
+    """Test that every extra is a list of requirement strings."""
+    extras = project['optional-dependencies']
+    assert 'speed' in extras
+    for name, requirements in extras.items():
+        assert isinstance(requirements, list), name
+        assert all(isinstance(req, str) for req in requirements), name